@@ -2,13 +2,38 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
-from docx import Document
+from lxml.etree import XPath
 
-from mcp_server.docx_parser import _detect_heading_level
+from mcp_server.docx_parser import _load_document
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Names the numbering, field-code and bookmark scans compare tags against
+_Q_numId = f"{{{_W}}}numId"
+_Q_ilvl = f"{{{_W}}}ilvl"
+_Q_val = f"{{{_W}}}val"
+_Q_num = f"{{{_W}}}num"
+_Q_abstractNumId = f"{{{_W}}}abstractNumId"
+_Q_abstractNum = f"{{{_W}}}abstractNum"
+_Q_lvl = f"{{{_W}}}lvl"
+_Q_numFmt = f"{{{_W}}}numFmt"
+_Q_r = f"{{{_W}}}r"
+_Q_t = f"{{{_W}}}t"
+_Q_fldChar = f"{{{_W}}}fldChar"
+_Q_instrText = f"{{{_W}}}instrText"
+_Q_fldCharType = f"{{{_W}}}fldCharType"
+_Q_bookmarkStart = f"{{{_W}}}bookmarkStart"
+_Q_name = f"{{{_W}}}name"
+
+# Compiled once; evaluated in C without building an intermediate pPr proxy
+_XP_pPr_numPr = XPath("w:pPr/w:numPr", namespaces={"w": _W})
 
 
 # ── whitespace ─────────────────────────────────────────────────────
@@ -16,138 +41,151 @@ from mcp_server.docx_parser import _detect_heading_level
 _RE_DOUBLE_SPACE = re.compile(r"  +")
 
 
-def _find_parent_heading(paragraphs, idx: int) -> str | None:
-    """Walk backwards from idx to find the nearest heading."""
-    for i in range(idx - 1, -1, -1):
-        level = _detect_heading_level(paragraphs[i])
-        if level is not None:
-            return paragraphs[i].text.strip()
-    return None
+# Lightweight issue record; converted to the public dict shape on return
+_Issue = namedtuple("_Issue", "type paragraph_index section text detail")
 
 
-def check_whitespace(filepath: str) -> dict[str, Any]:
-    """Find whitespace issues in a .docx document.
-
-    Checks for:
-      - Double (or more) consecutive spaces within text
-      - Trailing whitespace at end of paragraph text
-      - Leading whitespace at start of paragraph text
-      - Consecutive blank paragraphs
+def _scan_ws(text: str) -> tuple[int, int, list[tuple[int, int]]]:
+    """Return (leading count, trailing count, double-space spans) for text.
 
-    Returns:
-      {filepath, issue_count, issues: [{type, paragraph_index,
-       section, text, detail}, ...]}
+    Character offsets throughout; the strip copies are only made when the
+    first/last character is whitespace, and the regex only runs when a
+    literal double space is present.
     """
-    if not os.path.isfile(filepath):
-        return {"error": f"File not found: {filepath}"}
+    leading = len(text) - len(text.lstrip()) if text[:1].isspace() else 0
+    trailing = len(text) - len(text.rstrip()) if text[-1:].isspace() else 0
+    if "  " not in text:
+        return leading, trailing, []
+    return leading, trailing, [m.span() for m in _RE_DOUBLE_SPACE.finditer(text)]
 
-    doc = Document(filepath)
-    paragraphs = doc.paragraphs
-    issues: list[dict[str, Any]] = []
 
-    prev_blank = False
+def _ellipsize(s: str, n: int = 80) -> str:
+    """Truncate s to n characters, appending '…' when anything was cut."""
+    return s if len(s) <= n else s[:n] + "…"
+
 
-    for idx, p in enumerate(paragraphs):
-        text = p.text
-        level = _detect_heading_level(p)
+def _whitespace_issues(
+    elements, texts: list[str], levels: list[int | None]
+) -> list[_Issue]:
+    """Scan paragraphs for whitespace issues (see check_whitespace)."""
+    issues: list[_Issue] = []
+    issues_append = issues.append
 
+    prev_blank = False
+    current_section: str | None = None
+
+    for idx, text in enumerate(texts):
         # Skip headings themselves
-        if level is not None:
+        if levels[idx] is not None:
             prev_blank = False
+            current_section = text.strip()
             continue
 
-        section = _find_parent_heading(paragraphs, idx)
-        is_blank = text.strip() == ""
+        section = current_section
+        is_blank = (not text) or text.isspace()
 
         # Consecutive blank paragraphs
         if is_blank and prev_blank:
-            issues.append({
-                "type": "consecutive_blank_paragraphs",
-                "paragraph_index": idx,
-                "section": section,
-                "text": "",
-                "detail": "Multiple consecutive blank paragraphs",
-            })
+            issues_append(_Issue(
+                "consecutive_blank_paragraphs", idx, section, "",
+                "Multiple consecutive blank paragraphs",
+            ))
         prev_blank = is_blank
 
         if is_blank:
             continue
 
+        # Fast path: clean paragraphs (the vast majority) need no scan
+        if not (text[0].isspace() or text[-1].isspace() or "  " in text):
+            continue
+
+        leading_len, trailing_len, runs = _scan_ws(text)
+        end_len = len(text) - trailing_len
+
         # Double spaces
-        for m in _RE_DOUBLE_SPACE.finditer(text):
-            start = max(0, m.start() - 20)
-            end = min(len(text), m.end() + 20)
-            context = text[start:end]
-            issues.append({
-                "type": "double_space",
-                "paragraph_index": idx,
-                "section": section,
-                "text": text[:80] + ("…" if len(text) > 80 else ""),
-                "detail": f"Multiple spaces at position {m.start()}: \"…{context}…\"",
-            })
+        if runs:
+            display = _ellipsize(text)
+            for run_start, run_end in runs:
+                start = max(0, run_start - 20)
+                end = min(len(text), run_end + 20)
+                context = text[start:end]
+                issues_append(_Issue(
+                    "double_space", idx, section, display,
+                    f"Multiple spaces at position {run_start}: \"…{context}…\"",
+                ))
 
         # Trailing whitespace
-        if text != text.rstrip():
-            trailing = text[len(text.rstrip()):]
-            issues.append({
-                "type": "trailing_whitespace",
-                "paragraph_index": idx,
-                "section": section,
-                "text": text.rstrip()[:80] + ("…" if len(text.rstrip()) > 80 else ""),
-                "detail": f"{len(trailing)} trailing whitespace character(s)",
-            })
+        if trailing_len:
+            issues_append(_Issue(
+                "trailing_whitespace", idx, section, _ellipsize(text[:end_len]),
+                f"{trailing_len} trailing whitespace character(s)",
+            ))
 
         # Leading whitespace (skip list items — they may be indented)
-        if text != text.lstrip() and not _is_list_item(p):
-            leading = text[:len(text) - len(text.lstrip())]
-            issues.append({
-                "type": "leading_whitespace",
-                "paragraph_index": idx,
-                "section": section,
-                "text": text.strip()[:80] + ("…" if len(text.strip()) > 80 else ""),
-                "detail": f"{len(leading)} leading whitespace character(s)",
-            })
+        if leading_len and not _is_list_item(elements[idx]):
+            stripped = text[leading_len:end_len]
+            issues_append(_Issue(
+                "leading_whitespace", idx, section, _ellipsize(stripped),
+                f"{leading_len} leading whitespace character(s)",
+            ))
+
+    return issues
+
+
+def check_whitespace(filepath: str, count_only: bool = False) -> dict[str, Any]:
+    """Find whitespace issues in a .docx document.
+
+    Checks for:
+      - Double (or more) consecutive spaces within text
+      - Trailing whitespace at end of paragraph text
+      - Leading whitespace at start of paragraph text
+      - Consecutive blank paragraphs
+
+    Returns:
+      {filepath, issue_count, issues: [{type, paragraph_index,
+       section, text, detail}, ...]}
+      With count_only=True the issues list is omitted (never serialized).
+    """
+    if not os.path.isfile(filepath):
+        return {"error": f"File not found: {filepath}"}
 
+    _doc, elements, texts, levels = _load_document(filepath)
+    issues = _whitespace_issues(elements, texts, levels)
+
+    if count_only:
+        return {"filepath": filepath, "issue_count": len(issues)}
     return {
         "filepath": filepath,
         "issue_count": len(issues),
-        "issues": issues,
+        "issues": [i._asdict() for i in issues],
     }
 
 
-def _is_list_item(paragraph) -> bool:
-    """Check if a paragraph is a Word list item (has numPr in XML)."""
-    W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-    pPr = paragraph._element.find(f"{{{W}}}pPr")
-    if pPr is not None:
-        numPr = pPr.find(f"{{{W}}}numPr")
-        if numPr is not None:
-            return True
-    return False
+def _is_list_item(p_el) -> bool:
+    """Check if a <w:p> element is a Word list item (has numPr in XML)."""
+    return bool(_XP_pPr_numPr(p_el))
 
 
 # ── enumeration check ──────────────────────────────────────────────
 
-_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-
-_RE_ENUM_BOTH_PARENS = re.compile(r'^\(([a-z]{1,4})\)\s', re.IGNORECASE)
-_RE_ENUM_RIGHT_PAREN = re.compile(r'^([a-z]{1,4})\)\s', re.IGNORECASE)
+# "(a) " or "a) " — one match decides both marker styles
+_RE_ENUM = re.compile(
+    r'^(?:\((?P<paren>[a-z]{1,4})\)|(?P<right>[a-z]{1,4})\))\s', re.IGNORECASE
+)
 
 
-def _get_numPr(paragraph) -> tuple[int, int] | None:
-    """Extract (numId, ilvl) from paragraph XML, or None if not a Word list item."""
-    pPr = paragraph._element.find(f"{{{_W}}}pPr")
-    if pPr is None:
+def _get_numPr(p_el) -> tuple[int, int] | None:
+    """Extract (numId, ilvl) from <w:p> XML, or None if not a Word list item."""
+    found = _XP_pPr_numPr(p_el)
+    if not found:
         return None
-    numPr = pPr.find(f"{{{_W}}}numPr")
-    if numPr is None:
-        return None
-    numId_el = numPr.find(f"{{{_W}}}numId")
-    ilvl_el = numPr.find(f"{{{_W}}}ilvl")
+    numPr = found[0]
+    numId_el = numPr.find(_Q_numId)
+    ilvl_el = numPr.find(_Q_ilvl)
     if numId_el is None or ilvl_el is None:
         return None
-    numId = numId_el.get(f"{{{_W}}}val")
-    ilvl = ilvl_el.get(f"{{{_W}}}val")
+    numId = numId_el.get(_Q_val)
+    ilvl = ilvl_el.get(_Q_val)
     if numId is None or ilvl is None:
         return None
     return (int(numId), int(ilvl))
@@ -163,21 +201,21 @@ def _get_num_format(doc, numId: int, ilvl: int) -> str | None:
         return None
     root = numbering_part._element
     abs_num_id = None
-    for num_el in root.findall(f"{{{_W}}}num"):
-        if num_el.get(f"{{{_W}}}numId") == str(numId):
-            abs_ref = num_el.find(f"{{{_W}}}abstractNumId")
+    for num_el in root.findall(_Q_num):
+        if num_el.get(_Q_numId) == str(numId):
+            abs_ref = num_el.find(_Q_abstractNumId)
             if abs_ref is not None:
-                abs_num_id = abs_ref.get(f"{{{_W}}}val")
+                abs_num_id = abs_ref.get(_Q_val)
             break
     if abs_num_id is None:
         return None
-    for abs_num in root.findall(f"{{{_W}}}abstractNum"):
-        if abs_num.get(f"{{{_W}}}abstractNumId") == abs_num_id:
-            for lvl in abs_num.findall(f"{{{_W}}}lvl"):
-                if lvl.get(f"{{{_W}}}ilvl") == str(ilvl):
-                    num_fmt = lvl.find(f"{{{_W}}}numFmt")
+    for abs_num in root.findall(_Q_abstractNum):
+        if abs_num.get(_Q_abstractNumId) == abs_num_id:
+            for lvl in abs_num.findall(_Q_lvl):
+                if lvl.get(_Q_ilvl) == str(ilvl):
+                    num_fmt = lvl.find(_Q_numFmt)
                     if num_fmt is not None:
-                        return num_fmt.get(f"{{{_W}}}val")
+                        return num_fmt.get(_Q_val)
     return None
 
 
@@ -189,13 +227,19 @@ def _detect_text_list_pattern(text: str) -> dict[str, str] | None:
     Returns dict with 'style' ('(x)' or 'x)') and 'marker' (str),
     or None if no pattern matched.
     """
-    m = _RE_ENUM_BOTH_PARENS.match(text)
-    if m:
-        return {"style": "(x)", "marker": m.group(1).lower()}
-    m = _RE_ENUM_RIGHT_PAREN.match(text)
-    if m:
-        return {"style": "x)", "marker": m.group(1).lower()}
-    return None
+    # Cheap first-character gate — most paragraphs never reach the regex
+    if not text:
+        return None
+    c0 = text[0]
+    if c0 != "(" and not ("a" <= c0.lower() <= "z"):
+        return None
+
+    m = _RE_ENUM.match(text)
+    if m is None:
+        return None
+    if m.group("paren"):
+        return {"style": "(x)", "marker": m.group("paren").lower()}
+    return {"style": "x)", "marker": m.group("right").lower()}
 
 
 def _get_terminator(text: str) -> str:
@@ -228,64 +272,51 @@ def _check_list_delimiters(items: list[dict]) -> list[dict[str, Any]]:
     return []
 
 
-def check_enumerations(filepath: str) -> dict[str, Any]:
-    """Check enumeration delimiter consistency in a .docx document.
-
-    Detects text-pattern list items: (a)/(b), a)/b), (i)/(ii), etc.
-    Reports runs where non-last items use mixed terminators (e.g. ',' and ';').
-
-    Returns:
-      {filepath, issue_count, issues: [{type, paragraph_index, section,
-       text, detail, terminators}, ...]}
-    """
-    if not os.path.isfile(filepath):
-        return {"error": f"File not found: {filepath}"}
-
-    doc = Document(filepath)
-    paragraphs = doc.paragraphs
+def _enumeration_issues(
+    texts: list[str], levels: list[int | None]
+) -> list[dict[str, Any]]:
+    """Scan paragraphs for enumeration issues (see check_enumerations)."""
     result_issues: list[dict[str, Any]] = []
+    issues_append = result_issues.append
 
+    # One list object for the whole scan — flush() clears it in place
     current_run: list[dict[str, Any]] = []
+    run_append = current_run.append
     current_section: str | None = None
 
     def flush() -> None:
         for prob in _check_list_delimiters(current_run):
             first = current_run[0]
-            result_issues.append({
+            issues_append({
                 "type": prob["check"],
                 "paragraph_index": first["paragraph_index"],
                 "section": first["section"],
-                "text": first["text"][:80] + ("…" if len(first["text"]) > 80 else ""),
+                "text": _ellipsize(first["text"]),
                 "detail": prob["detail"],
                 "terminators": prob["terminators"],
             })
+        current_run.clear()
 
-    for idx, p in enumerate(paragraphs):
-        level = _detect_heading_level(p)
-        if level is not None:
+    for idx, text in enumerate(texts):
+        if levels[idx] is not None:
             flush()
-            current_run = []
-            current_section = p.text.strip()
+            current_section = text.strip()
             continue
 
-        text = p.text
-        if not text.strip():
+        if (not text) or text.isspace():
             flush()
-            current_run = []
             continue
 
         item_info = _detect_text_list_pattern(text)
         if item_info is None:
             flush()
-            current_run = []
             continue
 
         # Flush and restart if delimiter style changes mid-run
         if current_run and current_run[-1]["style"] != item_info["style"]:
             flush()
-            current_run = []
 
-        current_run.append({
+        run_append({
             "paragraph_index": idx,
             "section": current_section,
             "text": text,
@@ -295,88 +326,254 @@ def check_enumerations(filepath: str) -> dict[str, Any]:
 
     flush()  # handle any trailing run at end of document
 
+    return result_issues
+
+
+def check_enumerations(filepath: str, count_only: bool = False) -> dict[str, Any]:
+    """Check enumeration delimiter consistency in a .docx document.
+
+    Detects text-pattern list items: (a)/(b), a)/b), (i)/(ii), etc.
+    Reports runs where non-last items use mixed terminators (e.g. ',' and ';').
+
+    Returns:
+      {filepath, issue_count, issues: [{type, paragraph_index, section,
+       text, detail, terminators}, ...]}
+      With count_only=True the issues list is omitted.
+    """
+    if not os.path.isfile(filepath):
+        return {"error": f"File not found: {filepath}"}
+
+    _doc, _elements, texts, levels = _load_document(filepath)
+    issues = _enumeration_issues(texts, levels)
+
+    if count_only:
+        return {"filepath": filepath, "issue_count": len(issues)}
     return {
         "filepath": filepath,
-        "issue_count": len(result_issues),
-        "issues": result_issues,
+        "issue_count": len(issues),
+        "issues": issues,
     }
 
 
+# ── combined checks ────────────────────────────────────────────────
+
+
+def run_all_checks(filepath: str) -> dict[str, Any]:
+    """Run the whitespace and enumeration checks in one call.
+
+    Both scans share a single parsed document and heading-level list.
+
+    Returns:
+      {filepath, whitespace: {issue_count, issues},
+       enumerations: {issue_count, issues}}
+    """
+    if not os.path.isfile(filepath):
+        return {"error": f"File not found: {filepath}"}
+
+    _doc, elements, texts, levels = _load_document(filepath)
+    ws_issues = [i._asdict() for i in _whitespace_issues(elements, texts, levels)]
+    en_issues = _enumeration_issues(texts, levels)
+
+    return {
+        "filepath": filepath,
+        "whitespace": {"issue_count": len(ws_issues), "issues": ws_issues},
+        "enumerations": {"issue_count": len(en_issues), "issues": en_issues},
+    }
+
+
+# ── batch checks ───────────────────────────────────────────────────
+
+
+def _default_workers() -> int | None:
+    """Worker count from LEGAL_ANALYZER_WORKERS, or None (= CPU count).
+
+    Values below 1 are clamped to 1; a non-integer value is a config
+    error and raises ValueError.
+    """
+    value = os.environ.get("LEGAL_ANALYZER_WORKERS", "").strip()
+    if not value:
+        return None
+    try:
+        return max(1, int(value))
+    except ValueError:
+        raise ValueError(
+            f"LEGAL_ANALYZER_WORKERS must be an integer, got {value!r}"
+        ) from None
+
+
+def _map_files(func, filepaths: list[str], workers: int | None) -> list[dict[str, Any]]:
+    """Apply a single-file check to every path in a process pool.
+
+    Each file is parsed and scanned in its own worker process, so the
+    pure-Python loops scale across cores. Results keep the order of
+    filepaths and are identical to calling func on each path. For files
+    on a single rotating disk, pass workers=1 — parallel reads seek
+    against each other and are slower than a sequential pass. workers
+    <= 1 runs the files serially in this process.
+    """
+    if workers is None:
+        workers = _default_workers() or os.cpu_count() or 1
+    if workers <= 1:
+        # Serial pass — no pool to spin up for a single worker
+        return [func(path) for path in filepaths]
+    # A few chunks per worker: amortizes IPC without starving small batches
+    chunksize = max(1, len(filepaths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(func, filepaths, chunksize=chunksize))
+
+
+def check_whitespace_many(
+    filepaths: list[str], workers: int | None = None
+) -> list[dict[str, Any]]:
+    """Run check_whitespace over many files in a process pool (see _map_files)."""
+    return _map_files(check_whitespace, filepaths, workers)
+
+
+def check_enumerations_many(
+    filepaths: list[str], workers: int | None = None
+) -> list[dict[str, Any]]:
+    """Run check_enumerations over many files in a process pool (see _map_files)."""
+    return _map_files(check_enumerations, filepaths, workers)
+
+
 # ── reference extraction & validation ──────────────────────────────
 
-# Text extraction patterns — various Czech grammatical forms
-_RE_CL_ABBR  = re.compile(r'\bčl\.\s*(\d+(?:\.\d+)*)\b')
-_RE_CLANEK   = re.compile(r'\bčlánk\w{0,3}\s+(\d+(?:\.\d+)*)\b', re.IGNORECASE)
-_RE_PRILOHA  = re.compile(r'\bpřílo\w{1,4}\s+č\.\s*(\d+)\b', re.IGNORECASE)
-_RE_PARA_LAW = re.compile(r'§\s*(\d+\w*)\b')
+# Text extraction pattern — various Czech grammatical forms, one
+# alternative per reference kind so each paragraph is scanned once.
+# Case sensitivity is scoped per alternative ("čl." stays case-sensitive).
+_RE_REFS = re.compile(
+    r'(?P<cl_abbr>\bčl\.\s*(?P<cl_abbr_n>\d+(?:\.\d+)*)\b)'
+    r'|(?i:(?P<clanek>\bčlánk\w{0,3}\s+(?P<clanek_n>\d+(?:\.\d+)*)\b))'
+    r'|(?i:(?P<priloha>\bpřílo\w{1,4}\s+č\.\s*(?P<priloha_n>\d+)\b))'
+    r'|(?P<para>§\s*(?P<para_n>\d+\w*)\b)'
+)
+
+# alternative name → (ref type, normalized text template)
+_REF_KINDS = {
+    "cl_abbr": ("článek", "článek {}"),
+    "clanek": ("článek", "článek {}"),
+    "priloha": ("příloha", "příloha č. {}"),
+    "para": ("§", "§ {}"),
+}
 
 # Heading match patterns for building the valid-target sets
 _RE_H_CLANEK  = re.compile(r'^[Čč]lánek\s+(\d+)\b')
 _RE_H_PRILOHA = re.compile(r'^[Pp]říloha\s+č\.\s*(\d+)\b')
 
 
-def _extract_field_codes(doc) -> list[dict[str, Any]]:
-    """Walk paragraph XML to extract REF/PAGEREF Word field codes.
+_REF_PREFIXES = ("REF ", "PAGEREF ")
+
+
+def _may_be_ref(head: str) -> bool:
+    """True while an (upper-cased, lstripped) instruction head can still
+    turn out to start with REF/PAGEREF — it may be split across runs."""
+    return any(head[:len(p)] == p[:len(head)] for p in _REF_PREFIXES)
 
-    Returns list of {instr, display_text, paragraph_index}.
+
+def _extract_fields_and_bookmarks(
+    elements,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Walk paragraph XML once for REF/PAGEREF field codes and bookmarks.
+
+    Field codes are read from the paragraph's own runs; bookmark names
+    from <w:bookmarkStart> anywhere inside the paragraph, runs included.
+
+    Returns (field_codes, bookmarks), field codes as
+    {instr, display_text, paragraph_index}.
     """
     result: list[dict[str, Any]] = []
+    bookmarks: list[str] = []
 
-    for p_idx, para in enumerate(doc.paragraphs):
+    for p_idx, p_el in enumerate(elements):
         state: str | None = None
         instr_buf: list[str] = []
         display_buf: list[str] = []
-
-        for run_el in para._element:
-            if run_el.tag != f"{{{_W}}}r":
+        head_checked = False
+
+        for el in p_el:
+            tag = el.tag
+            if tag == _Q_bookmarkStart:
+                name = el.get(_Q_name)
+                if name:
+                    bookmarks.append(name)
+                continue
+            if tag != _Q_r:
+                # Bookmarks can also sit inside hyperlinks, insertions, ...
+                for bm in el.iter(_Q_bookmarkStart):
+                    name = bm.get(_Q_name)
+                    if name:
+                        bookmarks.append(name)
                 continue
-            for child in run_el:
-                local = child.tag.split("}")[1] if "}" in child.tag else child.tag
 
-                if local == "fldChar":
-                    fc_type = child.get(f"{{{_W}}}fldCharType")
+            # A bookmark may also be nested inside the run itself
+            for bm in el.iter(_Q_bookmarkStart):
+                name = bm.get(_Q_name)
+                if name:
+                    bookmarks.append(name)
+
+            # Tag filter runs in C — only field parts and text reach Python
+            for child in el.iterchildren(_Q_fldChar, _Q_instrText, _Q_t):
+                tag = child.tag
+                if tag == _Q_fldChar:
+                    fc_type = child.get(_Q_fldCharType)
                     if fc_type == "begin":
                         state, instr_buf, display_buf = "instr", [], []
+                        head_checked = False
                     elif fc_type == "separate":
-                        state = "display"
+                        if state != "skip":
+                            state = "display"
                     elif fc_type == "end":
-                        instr = "".join(instr_buf).strip()
-                        if instr.upper().lstrip().startswith(("REF ", "PAGEREF ")):
-                            result.append({
-                                "instr": instr,
-                                "display_text": "".join(display_buf).strip(),
-                                "paragraph_index": p_idx,
-                            })
+                        if state != "skip":
+                            instr = "".join(instr_buf).strip()
+                            if instr.upper().lstrip().startswith(_REF_PREFIXES):
+                                result.append({
+                                    "instr": instr,
+                                    "display_text": "".join(display_buf).strip(),
+                                    "paragraph_index": p_idx,
+                                })
                         state = None
-                elif local == "instrText" and state == "instr":
-                    instr_buf.append(child.text or "")
-                elif local == "t" and state == "display":
+                elif tag == _Q_instrText:
+                    if state == "instr":
+                        instr_buf.append(child.text or "")
+                        if not head_checked:
+                            # TOC, PAGE, HYPERLINK, ... — drop the rest of
+                            # the field as soon as the prefix rules out REF
+                            head = "".join(instr_buf).lstrip().upper()
+                            if not _may_be_ref(head):
+                                state = "skip"
+                            head_checked = len(head) >= len(_REF_PREFIXES[-1])
+                elif state == "display":
                     display_buf.append(child.text or "")
 
-    return result
+    return result, bookmarks
 
 
-def _extract_text_references(paragraphs) -> list[dict[str, Any]]:
-    """Extract Czech legal text references from paragraphs.
+def _extract_text_references(
+    texts: list[str], levels: list[int | None]
+) -> list[dict[str, Any]]:
+    """Extract Czech legal text references from paragraph texts.
 
     Returns list of {text, raw, type, target, section, paragraph_index}.
     """
     result: list[dict[str, Any]] = []
     current_section: str | None = None
 
-    for idx, para in enumerate(paragraphs):
-        level = _detect_heading_level(para)
-        if level is not None:
-            current_section = para.text.strip()
+    for idx, text in enumerate(texts):
+        if levels[idx] is not None:
+            current_section = text.strip()
             continue
 
-        text = para.text
-        if not text.strip():
+        # Every reference form contains "č"/"Č" or "§" — skip the regex
+        # for the (majority of) paragraphs that contain none of them
+        if "č" not in text and "Č" not in text and "§" not in text:
             continue
 
-        def _add(m, ref_type: str, normalized: str, target: str) -> None:
+        for m in _RE_REFS.finditer(text):
+            kind = m.lastgroup
+            ref_type, template = _REF_KINDS[kind]
+            target = m.group(kind + "_n")
             result.append({
-                "text": normalized,
+                "text": template.format(target),
                 "raw": m.group(0).strip(),
                 "type": ref_type,
                 "target": target,
@@ -384,30 +581,32 @@ def _extract_text_references(paragraphs) -> list[dict[str, Any]]:
                 "paragraph_index": idx,
             })
 
-        for m in _RE_CL_ABBR.finditer(text):
-            _add(m, "článek", f"článek {m.group(1)}", m.group(1))
-
-        for m in _RE_CLANEK.finditer(text):
-            _add(m, "článek", f"článek {m.group(1)}", m.group(1))
-
-        for m in _RE_PRILOHA.finditer(text):
-            _add(m, "příloha", f"příloha č. {m.group(1)}", m.group(1))
-
-        for m in _RE_PARA_LAW.finditer(text):
-            _add(m, "§", f"§ {m.group(1)}", m.group(1))
-
     return result
 
 
-def _get_bookmarks(doc) -> list[str]:
-    """Extract all bookmark names from the document."""
-    bookmarks: list[str] = []
-    for para in doc.paragraphs:
-        for el in para._element.iter(f"{{{_W}}}bookmarkStart"):
-            name = el.get(f"{{{_W}}}name")
-            if name:
-                bookmarks.append(name)
-    return bookmarks
+@functools.lru_cache(maxsize=32)
+def _article_and_annex_nums(
+    heading_texts: tuple[str, ...],
+) -> tuple[frozenset[str], frozenset[str]]:
+    """Return the (article, annex) numbers declared by a document's headings.
+
+    Cached on the heading texts, so re-validating an unchanged document
+    skips the regex pass.
+    """
+    article_nums: set[str] = set()
+    annex_nums: set[str] = set()
+    for text in heading_texts:
+        # Dispatch on the first letter so each heading enters at most one regex
+        first = text[:1]
+        if first in ("Č", "č"):
+            m = _RE_H_CLANEK.match(text)
+            if m:
+                article_nums.add(m.group(1))
+        elif first in ("P", "p"):
+            m = _RE_H_PRILOHA.match(text)
+            if m:
+                annex_nums.add(m.group(1))
+    return frozenset(article_nums), frozenset(annex_nums)
 
 
 def _validate_references(
@@ -418,23 +617,16 @@ def _validate_references(
 
     Only validates 'článek' and 'příloha' refs. § and others pass as valid.
     """
-    article_nums: set[str] = set()
-    annex_nums: set[str] = set()
-    for h in headings:
-        m = _RE_H_CLANEK.match(h["text"])
-        if m:
-            article_nums.add(m.group(1))
-            continue
-        m = _RE_H_PRILOHA.match(h["text"])
-        if m:
-            annex_nums.add(m.group(1))
+    article_nums, annex_nums = _article_and_annex_nums(
+        tuple(h["text"] for h in headings)
+    )
 
     valid: list[dict[str, Any]] = []
     invalid: list[dict[str, Any]] = []
 
     for ref in refs:
         if ref["type"] == "článek":
-            base = ref["target"].split(".")[0]
+            base = ref["target"].partition(".")[0]  # "4.2.1" → "4"
             (valid if base in article_nums else invalid).append(ref)
         elif ref["type"] == "příloha":
             (valid if ref["target"] in annex_nums else invalid).append(ref)
@@ -462,18 +654,16 @@ def extract_and_validate_references(filepath: str) -> dict[str, Any]:
     if not os.path.isfile(filepath):
         return {"error": f"File not found: {filepath}"}
 
-    doc = Document(filepath)
-    paragraphs = doc.paragraphs
+    _doc, elements, texts, levels = _load_document(filepath)
 
     headings = [
-        {"level": _detect_heading_level(p), "text": p.text.strip()}
-        for p in paragraphs
-        if _detect_heading_level(p) is not None
+        {"level": level, "text": text.strip()}
+        for text, level in zip(texts, levels)
+        if level is not None
     ]
 
-    field_code_refs = _extract_field_codes(doc)
-    text_refs = _extract_text_references(paragraphs)
-    bookmarks = _get_bookmarks(doc)
+    field_code_refs, bookmarks = _extract_fields_and_bookmarks(elements)
+    text_refs = _extract_text_references(texts, levels)
     valid_refs, invalid_refs = _validate_references(text_refs, headings)
 
     field_code_violations = [
@@ -489,3 +679,11 @@ def extract_and_validate_references(filepath: str) -> dict[str, Any]:
         "field_code_violations": field_code_violations,
         "bookmarks": bookmarks,
     }
+
+
+def extract_and_validate_references_many(
+    filepaths: list[str], workers: int | None = None
+) -> list[dict[str, Any]]:
+    """Run extract_and_validate_references over many files in a process pool
+    (see _map_files)."""
+    return _map_files(extract_and_validate_references, filepaths, workers)
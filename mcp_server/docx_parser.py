@@ -10,25 +10,54 @@ from __future__ import annotations
 
 import hashlib
 import os
+import threading
+from collections import OrderedDict, namedtuple
 from typing import Any
 
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
 from lxml import etree
 
 W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_P = f"{{{W}}}p"
+_PPR = f"{{{W}}}pPr"
+
+# Attribute lookups compiled once; each returns [] or [value]
+_XP_PSTYLE = etree.XPath(
+    "w:pPr/w:pStyle/@w:val", namespaces={"w": W}, smart_strings=False
+)
+_XP_OUTLINE = etree.XPath(
+    "w:pPr/w:outlineLvl/@w:val", namespaces={"w": W}, smart_strings=False
+)
 
 
 # ── helpers ────────────────────────────────────────────────────────
 
 
-def _detect_heading_level(paragraph) -> int | None:
-    """Return heading level (0-9) or None if paragraph is not a heading.
+def _detect_heading_level(
+    p_el, doc, style_names: dict[str | None, str]
+) -> int | None:
+    """Return heading level (0-9) or None if a <w:p> element is not a heading.
 
     Strategy:
       1. Style name like "Heading 1" → level 1
       2. XML fallback: <w:pPr><w:outlineLvl w:val="0"/> → level 1
+
+    A paragraph without <w:pPr> uses the default paragraph style and has
+    no outline level, so the style lookup is skipped for it.
+
+    style_names memoizes styleId → style name for doc; a document uses only
+    a handful of styles, and resolving one searches the styles part.
     """
-    style_name = paragraph.style.name or ""
+    if p_el.find(_PPR) is None:
+        return None
+
+    style_ids = _XP_PSTYLE(p_el)
+    style_id = style_ids[0] if style_ids else None
+    style_name = style_names.get(style_id)
+    if style_name is None:
+        style = doc.part.get_style(style_id, WD_STYLE_TYPE.PARAGRAPH)
+        style_name = style_names[style_id] = style.name or ""
 
     # "Heading 1", "Heading 2", ... or "Title" (level 0)
     if style_name == "Title":
@@ -39,17 +68,78 @@ def _detect_heading_level(paragraph) -> int | None:
             return int(parts[1])
 
     # XML fallback — custom styles with outline level set
-    pPr = paragraph._element.find(f"{{{W}}}pPr")
-    if pPr is not None:
-        outline = pPr.find(f"{{{W}}}outlineLvl")
-        if outline is not None:
-            val = outline.get(f"{{{W}}}val")
-            if val is not None and val.isdigit():
-                return int(val) + 1  # outlineLvl 0 = Heading 1
+    outline = _XP_OUTLINE(p_el)
+    if outline and outline[0].isdigit():
+        return int(outline[0]) + 1  # outlineLvl 0 = Heading 1
 
     return None
 
 
+# Parsed document shared by every tool call on the same file version
+_DocBundle = namedtuple("_DocBundle", "doc elements texts levels")
+
+
+# Up to _CACHE_SIZE bundles, least recently used first. Size is part of
+# the key so a rewrite within the filesystem's mtime granularity still
+# invalidates the entry.
+_CACHE_SIZE = 8
+_cache: OrderedDict[tuple[str, int, int], _DocBundle] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _load_doc(filepath: str) -> _DocBundle:
+    """Parse a .docx and derive the data every tool works from.
+
+    Returns (doc, elements, texts, levels) where elements are the body's
+    <w:p> elements (the same paragraphs doc.paragraphs would wrap) — no
+    Paragraph/Style wrapper objects are built per paragraph.
+    """
+    doc = Document(filepath)
+    elements = doc.element.body.findall(_P)
+    texts = [p.text for p in elements]
+    style_names: dict[str | None, str] = {}
+    levels = [_detect_heading_level(p, doc, style_names) for p in elements]
+    return _DocBundle(doc, elements, texts, levels)
+
+
+def _cache_key(filepath: str) -> tuple[str, int, int]:
+    path = os.path.abspath(filepath)
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def _load_document(filepath: str) -> _DocBundle:
+    """Return the cached (doc, elements, texts, levels) for filepath,
+    parsing it once per (path, mtime, size).
+
+    Callers must treat all four as read-only — the same objects are
+    handed to every tool call until the file changes on disk.
+    """
+    key = _cache_key(filepath)
+    with _cache_lock:
+        bundle = _cache.get(key)
+        if bundle is not None:
+            _cache.move_to_end(key)
+            return bundle
+    bundle = _load_doc(key[0])
+    with _cache_lock:
+        _cache[key] = bundle
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return bundle
+
+
+def _cached_document(filepath: str) -> _DocBundle | None:
+    """Return the cached bundle for filepath's current version, or None.
+
+    Unlike _load_document this never parses the file, for callers that
+    only gain from a bundle when one already exists.
+    """
+    key = _cache_key(filepath)
+    with _cache_lock:
+        return _cache.get(key)
+
+
 def _build_heading_tree(
     headings: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
@@ -58,42 +148,42 @@ def _build_heading_tree(
     Each node: {level, text, paragraph_index, children: [...]}.
     """
     root: list[dict[str, Any]] = []
-    stack: list[dict[str, Any]] = []  # tracks nesting context
+    # Nesting context as parallel stacks: open levels and their child lists
+    stack_levels: list[int] = []
+    stack_children: list[list[dict[str, Any]]] = []
 
     for h in headings:
-        node = {
-            "level": h["level"],
-            "text": h["text"],
-            "paragraph_index": h["paragraph_index"],
-            "children": [],
-        }
+        level = h["level"]
+        children: list[dict[str, Any]] = []
 
         # Pop stack until we find a parent with a lower level
-        while stack and stack[-1]["level"] >= node["level"]:
-            stack.pop()
+        while stack_levels and stack_levels[-1] >= level:
+            stack_levels.pop()
+            stack_children.pop()
 
-        if stack:
-            stack[-1]["children"].append(node)
-        else:
-            root.append(node)
+        (stack_children[-1] if stack_children else root).append({
+            "level": level,
+            "text": h["text"],
+            "paragraph_index": h["paragraph_index"],
+            "children": children,
+        })
 
-        stack.append(node)
+        stack_levels.append(level)
+        stack_children.append(children)
 
     return root
 
 
-def _section_paragraphs(
-    paragraphs, heading_idx: int, heading_level: int
-) -> list:
-    """Return paragraphs belonging to a section (from heading to next
-    same-or-higher-level heading, exclusive)."""
-    result = []
-    for i in range(heading_idx + 1, len(paragraphs)):
-        lvl = _detect_heading_level(paragraphs[i])
+def _section_end(
+    levels: list[int | None], heading_idx: int, heading_level: int
+) -> int:
+    """Return the index one past the last paragraph of a section (the next
+    same-or-higher-level heading, or the end of the document)."""
+    for i in range(heading_idx + 1, len(levels)):
+        lvl = levels[i]
         if lvl is not None and lvl <= heading_level:
-            break
-        result.append(paragraphs[i])
-    return result
+            return i
+    return len(levels)
 
 
 # ── public API ─────────────────────────────────────────────────────
@@ -112,20 +202,19 @@ def load_document_structure(filepath: str) -> dict[str, Any]:
     if not os.path.isfile(filepath):
         return {"error": f"File not found: {filepath}"}
 
-    doc = Document(filepath)
-    paragraphs = doc.paragraphs
+    _doc, _elements, texts, levels = _load_document(filepath)
 
     headings = []
-    for idx, p in enumerate(paragraphs):
-        level = _detect_heading_level(p)
+    for idx, text in enumerate(texts):
+        level = levels[idx]
         if level is not None:
             headings.append(
-                {"level": level, "text": p.text.strip(), "paragraph_index": idx}
+                {"level": level, "text": text.strip(), "paragraph_index": idx}
             )
 
     return {
         "filepath": filepath,
-        "paragraph_count": len(paragraphs),
+        "paragraph_count": len(texts),
         "heading_count": len(headings),
         "headings": headings,
         "heading_tree": _build_heading_tree(headings),
@@ -144,15 +233,14 @@ def get_section_content(filepath: str, heading_text: str) -> dict[str, Any]:
     if not os.path.isfile(filepath):
         return {"error": f"File not found: {filepath}"}
 
-    doc = Document(filepath)
-    paragraphs = doc.paragraphs
+    _doc, _elements, texts, levels = _load_document(filepath)
 
     # Find the target heading
     target_idx = None
     target_level = None
-    for idx, p in enumerate(paragraphs):
-        level = _detect_heading_level(p)
-        if level is not None and p.text.strip() == heading_text:
+    for idx, text in enumerate(texts):
+        level = levels[idx]
+        if level is not None and text.strip() == heading_text:
             target_idx = idx
             target_level = level
             break
@@ -160,22 +248,22 @@ def get_section_content(filepath: str, heading_text: str) -> dict[str, Any]:
     if target_idx is None:
         return {"error": f"Heading not found: {heading_text}"}
 
-    section_pars = _section_paragraphs(paragraphs, target_idx, target_level)
-    content_lines = [p.text for p in section_pars]
-    content = "\n".join(content_lines)
+    end = _section_end(levels, target_idx, target_level)
+    section_texts = texts[target_idx + 1:end]
+    content = "\n".join(section_texts)
 
     # Identify direct sub-headings
-    subsections = []
-    for p in section_pars:
-        lvl = _detect_heading_level(p)
-        if lvl is not None:
-            subsections.append(p.text.strip())
+    subsections = [
+        texts[i].strip()
+        for i in range(target_idx + 1, end)
+        if levels[i] is not None
+    ]
 
     return {
         "heading": heading_text,
         "level": target_level,
         "content": content,
-        "paragraph_count": len(section_pars),
+        "paragraph_count": len(section_texts),
         "subsections": subsections,
     }
 
@@ -193,20 +281,19 @@ def get_all_sections_summary(filepath: str) -> dict[str, Any]:
     if not os.path.isfile(filepath):
         return {"error": f"File not found: {filepath}"}
 
-    doc = Document(filepath)
-    paragraphs = doc.paragraphs
+    _doc, _elements, texts, levels = _load_document(filepath)
 
     # Collect all headings with their indices and levels
     headings = []
-    for idx, p in enumerate(paragraphs):
-        level = _detect_heading_level(p)
+    for idx, text in enumerate(texts):
+        level = levels[idx]
         if level is not None:
-            headings.append((idx, level, p.text.strip()))
+            headings.append((idx, level, text.strip()))
 
     sections = []
     for i, (h_idx, h_level, h_text) in enumerate(headings):
-        pars = _section_paragraphs(paragraphs, h_idx, h_level)
-        content = "\n".join(p.text for p in pars)
+        pars = texts[h_idx + 1:_section_end(levels, h_idx, h_level)]
+        content = "\n".join(pars)
 
         preview = content[:200]
         if len(content) > 200:
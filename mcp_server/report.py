@@ -2,17 +2,32 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import os
+import shutil
+import threading
+import uuid
 import zipfile
 from collections import defaultdict
 from datetime import date, datetime
-from io import BytesIO
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from lxml import etree
 
+from mcp_server.docx_parser import _DocBundle, _cached_document
+
+# orjson is optional: a faster drop-in for parsing large findings payloads
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
 _COMMENT_CONTENT_TYPE = (
     "application/vnd.openxmlformats-officedocument"
@@ -25,12 +40,66 @@ _COMMENT_REL_TYPE = (
 _RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
 _CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
 
+# Tags and attributes of the comment markup, rels and content types written below
+_P = f"{{{W}}}p"
+_PPR = f"{{{W}}}pPr"
+_R = f"{{{W}}}r"
+_RPR = f"{{{W}}}rPr"
+_RSTYLE = f"{{{W}}}rStyle"
+_T = f"{{{W}}}t"
+_VAL = f"{{{W}}}val"
+_ID = f"{{{W}}}id"
+_COMMENTS = f"{{{W}}}comments"
+_COMMENT = f"{{{W}}}comment"
+_AUTHOR = f"{{{W}}}author"
+_DATE = f"{{{W}}}date"
+_INITIALS = f"{{{W}}}initials"
+_COMMENT_RANGE_START = f"{{{W}}}commentRangeStart"
+_COMMENT_RANGE_END = f"{{{W}}}commentRangeEnd"
+_COMMENT_REFERENCE = f"{{{W}}}commentReference"
+_RELATIONSHIP = f"{{{_RELS_NS}}}Relationship"
+_OVERRIDE = f"{{{_CT_NS}}}Override"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# lxml parsers must not be shared across threads (tools may run in a
+# worker pool), so each thread lazily gets its own — see _xml_parser()
+_parser_local = threading.local()
+
+# Comment line prefixes for the categories save_results emits
+_CAT_PREFIX = {
+    "whitespace": "[WHITESPACE] ",
+    "enumeration": "[ENUMERATION] ",
+    "reference": "[REFERENCE] ",
+    "issue": "[ISSUE] ",
+}
+
+# Media that is already compressed — re-deflating it only burns CPU
+_PRECOMPRESSED = (".png", ".jpg", ".jpeg", ".gif", ".wdp")
+
+
+def _xml_parser() -> etree.XMLParser:
+    """Return this thread's parser for package parts.
+
+    collect_ids=False skips the xml:id index — parts are only navigated by
+    tag, never looked up by id. resolve_entities=False keeps external
+    entities out of documents we did not write.
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        # huge_tree deliberately left off: libxml2's size/depth limits
+        # stay on for untrusted uploads
+        parser = _parser_local.parser = etree.XMLParser(
+            collect_ids=False, resolve_entities=False
+        )
+    return parser
+
 
 # ── markdown ────────────────────────────────────────────────────────
 
 
-def _generate_markdown(findings: dict[str, Any]) -> str:
-    """Render a structured Czech-language markdown report from findings."""
+def _write_markdown(findings: dict[str, Any], out: TextIO) -> None:
+    """Render a structured Czech-language markdown report from findings,
+    streamed into *out*."""
     filepath = findings.get("filepath", "")
     filename = Path(filepath).name if filepath else "?"
     today = date.today().strftime("%Y-%m-%d")
@@ -45,76 +114,76 @@ def _generate_markdown(findings: dict[str, Any]) -> str:
     fv_count = len(refs.get("field_code_violations", []))
     total = ws_count + en_count + inv_count + fv_count
 
-    lines: list[str] = [
-        f"# Analýza dokumentu: {filename}",
-        "",
-        f"**Datum analýzy:** {today}  ",
-        f"**Soubor:** `{filepath}`",
-        "",
-        "## Souhrn",
-        "",
-        "| Kategorie | Počet nálezů |",
-        "|---|---|",
-        f"| Bílé znaky | {ws_count} |",
-        f"| Enumerace | {en_count} |",
-        f"| Neplatné reference | {inv_count} |",
-        f"| Chybějící pole (field codes) | {fv_count} |",
-        f"| **Celkem** | **{total}** |",
-        "",
-    ]
+    w = out.write
+
+    # Every block ends in "\n"; each section opens with the blank line
+    # that separates it from the previous block.
+    w(
+        f"# Analýza dokumentu: {filename}\n"
+        "\n"
+        f"**Datum analýzy:** {today}  \n"
+        f"**Soubor:** `{filepath}`\n"
+        "\n"
+        "## Souhrn\n"
+        "\n"
+        "| Kategorie | Počet nálezů |\n"
+        "|---|---|\n"
+        f"| Bílé znaky | {ws_count} |\n"
+        f"| Enumerace | {en_count} |\n"
+        f"| Neplatné reference | {inv_count} |\n"
+        f"| Chybějící pole (field codes) | {fv_count} |\n"
+        f"| **Celkem** | **{total}** |\n"
+    )
 
     # ── whitespace ──
     if ws_count:
-        lines += ["## Bílé znaky", ""]
+        w("\n## Bílé znaky\n\n")
         for issue in ws.get("issues", []):
-            lines.append(
-                f"- **{issue.get('type', '?')}** "
-                f"(odst. {issue.get('paragraph_index', '?')}, "
-                f"sekce: _{issue.get('section', '?')}_)  "
+            get = issue.get
+            w(
+                f"- **{get('type', '?')}** "
+                f"(odst. {get('paragraph_index', '?')}, "
+                f"sekce: _{get('section', '?')}_)  \n"
+                f"  `{get('detail', '')}`\n"
             )
-            lines.append(f"  `{issue.get('detail', '')}`")
-        lines.append("")
 
     # ── enumerations ──
     if en_count:
-        lines += ["## Enumerace", ""]
+        w("\n## Enumerace\n\n")
         for issue in en.get("issues", []):
-            lines.append(
-                f"- **{issue.get('type', '?')}** "
-                f"(odst. {issue.get('paragraph_index', '?')}, "
-                f"sekce: _{issue.get('section', '?')}_)  "
+            get = issue.get
+            w(
+                f"- **{get('type', '?')}** "
+                f"(odst. {get('paragraph_index', '?')}, "
+                f"sekce: _{get('section', '?')}_)  \n"
+                f"  `{get('detail', '')}`\n"
             )
-            lines.append(f"  `{issue.get('detail', '')}`")
-        lines.append("")
 
     # ── invalid references ──
     if inv_count:
-        lines += ["## Neplatné reference", ""]
+        w("\n## Neplatné reference\n\n")
         for ref in refs.get("invalid", []):
-            lines.append(
+            w(
                 f"- **{ref.get('text', '?')}** "
-                f"(sekce: _{ref.get('section', '?')}_) — cíl nenalezen"
+                f"(sekce: _{ref.get('section', '?')}_) — cíl nenalezen\n"
             )
-        lines.append("")
 
     # ── field code violations ──
     if fv_count:
-        lines += [
-            "## Chybějící pole (field codes)",
-            "",
-            "Následující reference jsou zapsány jako prostý text místo Word polí (REF):",
-            "",
-        ]
-        by_section: dict[str, list[str]] = defaultdict(list)
+        w(
+            "\n## Chybějící pole (field codes)\n"
+            "\n"
+            "Následující reference jsou zapsány jako prostý text místo Word polí (REF):\n"
+            "\n"
+        )
+        # Dedup while grouping — the same reference is often reported many times
+        by_section: dict[str, set[str]] = defaultdict(set)
         for ref in refs.get("field_code_violations", []):
-            by_section[ref.get("section", "Neznámá sekce")].append(
+            by_section[ref.get("section", "Neznámá sekce")].add(
                 ref.get("text", "?")
             )
         for sec, texts in by_section.items():
-            lines.append(f"- _{sec}_: {', '.join(sorted(set(texts)))}")
-        lines.append("")
-
-    return "\n".join(lines)
+            w(f"- _{sec}_: {', '.join(sorted(texts))}\n")
 
 
 # ── annotated docx ──────────────────────────────────────────────────
@@ -124,97 +193,151 @@ def _generate_annotated_docx(
     filepath: str,
     annotations: list[dict[str, Any]],
     output_path: str,
+    *,
+    bundle: _DocBundle | None = None,
 ) -> None:
     """Write a copy of *filepath* to *output_path* with Word comments injected.
 
     annotations: list of {paragraph_index, comment, category}
     Comments for the same paragraph are merged into one.
+
+    bundle: the parsed document from docx_parser._load_document, when the
+    caller already has it. Its document.xml tree is copied instead of
+    parsing the part again; the cached tree itself is never modified.
+    python-docx parsed that tree with remove_blank_text, so whitespace-only
+    text between elements (pretty-printed XML) is not carried over — the
+    output is equivalent to the unbundled path but not byte-identical.
     """
-    with zipfile.ZipFile(filepath, "r") as zin:
-        file_list = zin.namelist()
-        content_map: dict[str, bytes] = {n: zin.read(n) for n in file_list}
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
     if not annotations:
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        Path(output_path).write_bytes(content_map.get("", b""))
-        import shutil
-        shutil.copy2(filepath, output_path)
+        shutil.copyfile(filepath, output_path)
         return
 
-    # ── parse document.xml ──
-    doc_root = etree.fromstring(content_map["word/document.xml"])
-    all_paras = list(doc_root.iter(f"{{{W}}}p"))
+    # Compressed output streams straight to disk. It goes to a sibling temp
+    # file first: output_path may be filepath itself, which is still being
+    # read, and a failed run must not leave a truncated .docx behind. The
+    # name is unique per call, so concurrent saves to the same output
+    # never write into (and publish) each other's temp file.
+    tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        # Level 1: the rewritten XML parts still deflate well, at a
+        # fraction of the CPU of the default level 6
+        with zipfile.ZipFile(filepath, "r") as zin, zipfile.ZipFile(
+            tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+        ) as zout:
+            doc_root = None
+            if (
+                bundle is not None
+                and bundle.doc.part.partname == "/word/document.xml"
+            ):
+                doc_root = copy.deepcopy(bundle.doc.element)
+            _write_annotated_zip(zin, zout, annotations, doc_root)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _write_annotated_zip(
+    zin: zipfile.ZipFile,
+    zout: zipfile.ZipFile,
+    annotations: list[dict[str, Any]],
+    doc_root=None,
+) -> None:
+    """Copy the open archive *zin* into *zout* with comments injected.
 
-    # Group annotations by paragraph index
-    by_para: dict[int, list[dict]] = defaultdict(list)
-    for ann in annotations:
-        idx = ann["paragraph_index"]
-        if 0 <= idx < len(all_paras):
-            by_para[idx].append(ann)
+    Only the parts that change are read into memory; every other
+    member (media, fonts, ...) is streamed across unchanged. doc_root is
+    an already-parsed document.xml tree to modify in place, if any.
+    """
+    # ── parse document.xml ──
+    if doc_root is None:
+        doc_root = etree.fromstring(zin.read("word/document.xml"), _xml_parser())
+    all_paras = list(doc_root.iter(_P))
+
+    # Keep in-range annotations, ordered by paragraph; the sort is stable,
+    # so annotations on one paragraph keep their original order
+    n_paras = len(all_paras)
+    in_range = sorted(
+        (
+            (ann["paragraph_index"], ann)
+            for ann in annotations
+            if 0 <= ann["paragraph_index"] < n_paras
+        ),
+        key=itemgetter(0),
+    )
 
     # ── build comments.xml ──
+    # Extend an existing comments part (re-annotated output) rather than
+    # writing a second member of the same name
     date_str = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-    comments_root = etree.Element(f"{{{W}}}comments")
-    comment_id = 0
+    # Attributes every comment shares; only the id varies per comment
+    shared_attrib = {_AUTHOR: "Legal Analyzer", _DATE: date_str, _INITIALS: "LA"}
+    comments_key = "word/comments.xml"
+    has_comments = comments_key in zin.namelist()
+    if has_comments:
+        comments_root = etree.fromstring(zin.read(comments_key), _xml_parser())
+        comment_id = 1 + max(
+            (int(v) for el in comments_root if (v := el.get(_ID, "")).isdigit()),
+            default=-1,
+        )
+    else:
+        comments_root = etree.Element(_COMMENTS)
+        comment_id = 0
 
-    for para_idx in sorted(by_para):
-        anns = by_para[para_idx]
+    def cat_prefix(category: str) -> str:
+        return _CAT_PREFIX.get(category) or f"[{category.upper()}] "
+
+    for para_idx, group in groupby(in_range, key=itemgetter(0)):
+        anns = [ann for _, ann in group]
         combined = "\n".join(
-            f"[{a.get('category', 'issue').upper()}] {a['comment']}"
+            f"{cat_prefix(a.get('category', 'issue'))}{a['comment']}"
             for a in anns
         )
         para_el = all_paras[para_idx]
 
-        # Build <w:comment> element
-        c = etree.SubElement(comments_root, f"{{{W}}}comment")
-        c.set(f"{{{W}}}id", str(comment_id))
-        c.set(f"{{{W}}}author", "Legal Analyzer")
-        c.set(f"{{{W}}}date", date_str)
-        c.set(f"{{{W}}}initials", "LA")
-        p_el = etree.SubElement(c, f"{{{W}}}p")
-        r_el = etree.SubElement(p_el, f"{{{W}}}r")
-        t_el = etree.SubElement(r_el, f"{{{W}}}t")
-        t_el.text = combined
-        t_el.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
-
-        # Inject markers into the target paragraph
-        start = etree.Element(f"{{{W}}}commentRangeStart")
-        start.set(f"{{{W}}}id", str(comment_id))
+        cid = str(comment_id)
 
-        end = etree.Element(f"{{{W}}}commentRangeEnd")
-        end.set(f"{{{W}}}id", str(comment_id))
+        # Build <w:comment> element — attributes passed at construction
+        c = etree.SubElement(comments_root, _COMMENT, {_ID: cid, **shared_attrib})
+        p_el = etree.SubElement(c, _P)
+        r_el = etree.SubElement(p_el, _R)
+        t_el = etree.SubElement(r_el, _T, {_XML_SPACE: "preserve"})
+        t_el.text = combined
 
-        ref_run = etree.Element(f"{{{W}}}r")
-        rpr = etree.SubElement(ref_run, f"{{{W}}}rPr")
-        rs = etree.SubElement(rpr, f"{{{W}}}rStyle")
-        rs.set(f"{{{W}}}val", "CommentReference")
-        ref_el = etree.SubElement(ref_run, f"{{{W}}}commentReference")
-        ref_el.set(f"{{{W}}}id", str(comment_id))
+        # Inject markers into the target paragraph. Markers are created in
+        # the paragraph's own document (makeelement/SubElement) so lxml
+        # never has to merge a foreign tree into document.xml.
 
         # Insert start after <w:pPr> if present, else at position 0
-        insert_pos = 0
-        for i, child in enumerate(para_el):
-            if child.tag == f"{{{W}}}pPr":
-                insert_pos = i + 1
-                break
+        ppr = para_el.find(_PPR)
+        insert_pos = 0 if ppr is None else para_el.index(ppr) + 1
+        start = para_el.makeelement(_COMMENT_RANGE_START, {_ID: cid})
         para_el.insert(insert_pos, start)
-        para_el.append(end)
-        para_el.append(ref_run)
 
-        comment_id += 1
+        etree.SubElement(para_el, _COMMENT_RANGE_END, {_ID: cid})
 
-    # ── serialize modified parts ──
-    modified_doc = etree.tostring(
-        doc_root, xml_declaration=True, encoding="UTF-8", standalone=True
-    )
-    comments_xml = etree.tostring(
-        comments_root, xml_declaration=True, encoding="UTF-8", standalone=True
-    )
+        ref_run = etree.SubElement(para_el, _R)
+        rpr = etree.SubElement(ref_run, _RPR)
+        etree.SubElement(rpr, _RSTYLE, {_VAL: "CommentReference"})
+        etree.SubElement(ref_run, _COMMENT_REFERENCE, {_ID: cid})
+
+        comment_id += 1
 
     # ── update _rels ──
+    # Parts that already declare comments are copied through verbatim; a
+    # byte scan decides that without parsing them.
+    modified = {"word/document.xml": doc_root, comments_key: comments_root}
+
     rels_key = "word/_rels/document.xml.rels"
-    rels_root = etree.fromstring(content_map[rels_key])
-    if not any(el.get("Type") == _COMMENT_REL_TYPE for el in rels_root):
+    rels_raw = zin.read(rels_key)
+    rels_root = None
+    if _COMMENT_REL_TYPE.encode() not in rels_raw:
+        rels_root = etree.fromstring(rels_raw, _xml_parser())
+    if rels_root is not None and not any(
+        el.get("Type") == _COMMENT_REL_TYPE for el in rels_root
+    ):
         existing_ids = [el.get("Id", "") for el in rels_root]
         next_num = (
             max(
@@ -223,40 +346,55 @@ def _generate_annotated_docx(
             )
             + 1
         )
-        rel = etree.SubElement(rels_root, f"{{{_RELS_NS}}}Relationship")
+        rel = etree.SubElement(rels_root, _RELATIONSHIP)
         rel.set("Id", f"rId{next_num}")
         rel.set("Type", _COMMENT_REL_TYPE)
         rel.set("Target", "comments.xml")
-    modified_rels = etree.tostring(
-        rels_root, xml_declaration=True, encoding="UTF-8", standalone=True
-    )
+        modified[rels_key] = rels_root
 
     # ── update [Content_Types].xml ──
-    ct_root = etree.fromstring(content_map["[Content_Types].xml"])
-    if not any(el.get("PartName") == "/word/comments.xml" for el in ct_root):
-        override = etree.SubElement(ct_root, f"{{{_CT_NS}}}Override")
+    ct_key = "[Content_Types].xml"
+    ct_raw = zin.read(ct_key)
+    ct_root = None
+    if b"/word/comments.xml" not in ct_raw:
+        ct_root = etree.fromstring(ct_raw, _xml_parser())
+    if ct_root is not None and not any(
+        el.get("PartName") == "/word/comments.xml" for el in ct_root
+    ):
+        override = etree.SubElement(ct_root, _OVERRIDE)
         override.set("PartName", "/word/comments.xml")
         override.set("ContentType", _COMMENT_CONTENT_TYPE)
-    modified_ct = etree.tostring(
-        ct_root, xml_declaration=True, encoding="UTF-8", standalone=True
-    )
+        modified[ct_key] = ct_root
 
     # ── write new zip ──
-    buf = BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zout:
-        for name in file_list:
-            if name == "word/document.xml":
-                zout.writestr(name, modified_doc)
-            elif name == rels_key:
-                zout.writestr(name, modified_rels)
-            elif name == "[Content_Types].xml":
-                zout.writestr(name, modified_ct)
-            else:
-                zout.writestr(name, content_map[name])
-        zout.writestr("word/comments.xml", comments_xml)
-
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    Path(output_path).write_bytes(buf.getvalue())
+    for info in zin.infolist():
+        name = info.filename
+        root = modified.get(name)
+        if root is not None:
+            _write_xml_part(zout, name, root)
+        else:
+            # Fresh ZipInfo keeps the member's compression and metadata
+            # without mutating zin's own entry
+            out_info = zipfile.ZipInfo(name, info.date_time)
+            out_info.compress_type = (
+                zipfile.ZIP_STORED
+                if name.lower().endswith(_PRECOMPRESSED)
+                else info.compress_type
+            )
+            out_info.external_attr = info.external_attr
+            with zin.open(info) as src, zout.open(out_info, "w") as dst:
+                shutil.copyfileobj(src, dst, 1 << 16)
+    if not has_comments:
+        _write_xml_part(zout, comments_key, comments_root)
+
+
+def _write_xml_part(zout: zipfile.ZipFile, name: str, root) -> None:
+    """Serialize *root* straight into a new archive member — no
+    intermediate bytes copy of the XML."""
+    with zout.open(name, "w") as fh:
+        etree.ElementTree(root).write(
+            fh, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
 
 
 # ── public API ──────────────────────────────────────────────────────
@@ -284,40 +422,52 @@ def save_results(
         return {"error": f"File not found: {filepath}"}
 
     try:
-        findings: dict[str, Any] = json.loads(findings_json)
-    except json.JSONDecodeError as exc:
+        findings: dict[str, Any] = _json_loads(findings_json)
+    except ValueError as exc:  # json / orjson JSONDecodeError
         return {"error": f"Invalid findings_json: {exc}"}
 
     findings["filepath"] = filepath
 
     if format == "docx":
-        annotations: list[dict[str, Any]] = []
-
-        for issue in findings.get("whitespace", {}).get("issues", []):
-            annotations.append({
+        annotations: list[dict[str, Any]] = [
+            {
                 "paragraph_index": issue["paragraph_index"],
                 "comment": issue["detail"],
                 "category": "whitespace",
-            })
-        for issue in findings.get("enumerations", {}).get("issues", []):
-            annotations.append({
+            }
+            for issue in findings.get("whitespace", {}).get("issues", ())
+        ]
+        annotations += [
+            {
                 "paragraph_index": issue["paragraph_index"],
                 "comment": issue["detail"],
                 "category": "enumeration",
-            })
-        for ref in findings.get("references", {}).get("invalid", []):
-            annotations.append({
+            }
+            for issue in findings.get("enumerations", {}).get("issues", ())
+        ]
+        annotations += [
+            {
                 "paragraph_index": ref["paragraph_index"],
                 "comment": f"Neplatná reference: {ref['text']} — cíl nenalezen",
                 "category": "reference",
-            })
+            }
+            for ref in findings.get("references", {}).get("invalid", ())
+        ]
 
-        _generate_annotated_docx(filepath, annotations, output_path)
+        # The check tools that produced the findings have usually parsed
+        # this file version already; reuse that tree if so, but never
+        # load the whole document just for this — re-parsing
+        # document.xml alone is far cheaper
+        _generate_annotated_docx(
+            filepath, annotations, output_path,
+            bundle=_cached_document(filepath),
+        )
 
     else:  # markdown
-        md = _generate_markdown(findings)
+        # Streamed to disk — the report is never held in memory as a whole
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        Path(output_path).write_text(md, encoding="utf-8")
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 16) as fh:
+            _write_markdown(findings, fh)
 
     written = Path(output_path).stat().st_size
 
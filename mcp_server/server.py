@@ -76,35 +76,37 @@ def tool_get_all_sections_summary(filepath: str) -> dict:
 
 
 @mcp.tool
-def tool_check_whitespace(filepath: str) -> dict:
+def tool_check_whitespace(filepath: str, count_only: bool = False) -> dict:
     """Find whitespace issues in a .docx document.
 
     Checks for double spaces, trailing/leading whitespace, and
     consecutive blank paragraphs.
 
     Args:
-        filepath: Path to the .docx file.
+        filepath:   Path to the .docx file.
+        count_only: Return only issue_count, without the issues list.
 
     Returns a dict with: filepath, issue_count, issues (list of
     type, paragraph_index, section, text, detail).
     """
-    return check_whitespace(filepath)
+    return check_whitespace(filepath, count_only)
 
 
 @mcp.tool
-def tool_check_enumerations(filepath: str) -> dict:
+def tool_check_enumerations(filepath: str, count_only: bool = False) -> dict:
     """Check enumeration delimiter consistency in a .docx document.
 
     Detects text-pattern list items: (a)/(b), a)/b), (i)/(ii), etc.
     Reports runs where non-last items use mixed terminators (e.g. ',' and ';').
 
     Args:
-        filepath: Path to the .docx file.
+        filepath:   Path to the .docx file.
+        count_only: Return only issue_count, without the issues list.
 
     Returns a dict with: filepath, issue_count, issues (list of
     type, paragraph_index, section, text, detail, terminators).
     """
-    return check_enumerations(filepath)
+    return check_enumerations(filepath, count_only)
 
 
 @mcp.tool
@@ -0,0 +1,6 @@
+"""Filesystem locations shared by the tests and the test-document generator."""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TEST_DOC_PATH = ROOT / "documents" / "test_smlouva.docx"
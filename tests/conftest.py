@@ -0,0 +1,17 @@
+import pytest
+
+from tests._paths import TEST_DOC_PATH
+from tests.generate_test_doc import create_test_document
+
+
+@pytest.fixture(scope="session")
+def test_doc_path(tmp_path_factory) -> str:
+    """Path to a test_smlouva.docx freshly built for this session.
+
+    Built into a session temp directory, never over the committed copy in
+    documents/, so the tests always match generate_test_doc.py and a run
+    leaves the working tree untouched.
+    """
+    path = tmp_path_factory.mktemp("documents") / TEST_DOC_PATH.name
+    create_test_document(str(path))
+    return str(path)
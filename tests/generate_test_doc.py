@@ -29,444 +29,385 @@ Embedded issues:
     Adds padding articles/paragraphs to reach ~30 pages for stress testing.
 """
 
+import copy
+import functools
 import os
-import sys
+from collections import namedtuple
 
 from docx import Document
 from docx.shared import Pt
 from lxml import etree
 
 W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
 
 
+@functools.lru_cache(maxsize=None)
 def _qn(tag: str) -> str:
-    """Qualified name helper for OOXML tags."""
+    """Qualified name helper for OOXML tags (memoized per tag)."""
     return f"{{{W}}}{tag}"
 
 
-def add_bookmark(paragraph, name: str, bm_id: int):
-    """Insert a bookmark spanning the whole paragraph."""
-    p_elem = paragraph._element
-
-    bm_start = etree.SubElement(p_elem, _qn("bookmarkStart"))
-    bm_start.set(_qn("id"), str(bm_id))
-    bm_start.set(_qn("name"), name)
-
-    bm_end = etree.SubElement(p_elem, _qn("bookmarkEnd"))
-    bm_end.set(_qn("id"), str(bm_id))
-
-
-def create_test_document(output_path: str):
-    doc = Document()
-
-    # Default font
-    style = doc.styles["Normal"]
-    style.font.name = "Times New Roman"
-    style.font.size = Pt(12)
-
-    bm_id = 0  # bookmark counter
-
-    def add_padding_paragraphs(section_title: str, count: int = 6):
-        """Add verbose filler paragraphs to increase document length."""
-        for i in range(count):
-            doc.add_paragraph(
-                f"{section_title} – doplňující ustanovení {i + 1}. "
-                "Strany potvrzují, že veškeré činnosti budou prováděny "
-                "s odbornou péčí, v souladu s právními předpisy a interními "
-                "standardy Objednatele. Tato ustanovení slouží jako obecné "
-                "vymezení povinností a jsou uvedena pro účely testování "
-                "rozsáhlých dokumentů."
-            )
-
-    def add_padding_articles(start: int, end: int):
-        """Add extra articles to increase total pages without new issues."""
-        nonlocal bm_id
-        for number in range(start, end + 1):
-            h = doc.add_heading(f"Článek {number} – Doplňující ujednání", level=1)
-            bm_id += 1
-            add_bookmark(h, f"clanek_{number}", bm_id)
-            doc.add_paragraph(
-                "Strany se dohodly, že toto ustanovení má pouze informativní "
-                "povahu a nezakládá žádná nová práva či povinnosti nad rámec "
-                "této smlouvy."
-            )
-            doc.add_paragraph(
-                "Ustanovení se vykládá v souladu s ostatními částmi smlouvy "
-                "a má zajistit dostatečnou srozumitelnost a přehlednost "
-                "dokumentu."
-            )
-            add_padding_paragraphs(f"Článek {number}", count=4)
-
+_BM_START = _qn("bookmarkStart")
+_BM_END = _qn("bookmarkEnd")
+_ID = _qn("id")
+_NAME = _qn("name")
+
+
+def _append_paragraph(body, text: str = "", style_id: str | None = None):
+    """Append a <w:p> holding *text* to *body*, ahead of its final sectPr.
+
+    Builds the same markup as python-docx's Document.add_paragraph, but
+    straight in lxml: no Paragraph/Run wrappers and no style lookup —
+    *style_id* is the styleId itself (e.g. "Heading1", "ListNumber").
+    """
+    p_elem = body.makeelement(_qn("p"), {})
+    if style_id is not None:
+        p_pr = etree.SubElement(p_elem, _qn("pPr"))
+        etree.SubElement(p_pr, _qn("pStyle"), {_qn("val"): style_id})
+    if text:
+        t = etree.SubElement(etree.SubElement(p_elem, _qn("r")), _qn("t"))
+        t.text = text
+        if text.strip() != text:
+            t.set(_XML_SPACE, "preserve")
+    body[-1].addprevious(p_elem)
+    return p_elem
+
+
+def add_bookmark(p_elem, name: str, bm_id: int):
+    """Insert a bookmark spanning the whole <w:p> element."""
+    bm = str(bm_id)
+    p_elem.append(p_elem.makeelement(_BM_START, {_ID: bm, _NAME: name}))
+    p_elem.append(p_elem.makeelement(_BM_END, {_ID: bm}))
+
+
+def _append_page_break(body):
+    """Append a paragraph holding only a page break (Document.add_page_break)."""
+    p_elem = _append_paragraph(body)
+    br = etree.SubElement(etree.SubElement(p_elem, _qn("r")), _qn("br"))
+    br.set(_qn("type"), "page")
+
+
+# One heading and the paragraphs up to the next heading. A paragraph is
+# its text, or (text, style_id) for a styled one; bookmark names the
+# heading's bookmark; page_break puts a page break before the heading.
+_Section = namedtuple(
+    "_Section",
+    "title level bookmark paragraphs page_break",
+    defaults=(None, (), False),
+)
+
+
+def _padding(section_title: str, count: int = 6) -> list[str]:
+    """Verbose filler paragraphs to increase document length."""
+    return [
+        f"{section_title} – doplňující ustanovení {i + 1}. "
+        "Strany potvrzují, že veškeré činnosti budou prováděny "
+        "s odbornou péčí, v souladu s právními předpisy a interními "
+        "standardy Objednatele. Tato ustanovení slouží jako obecné "
+        "vymezení povinností a jsou uvedena pro účely testování "
+        "rozsáhlých dokumentů."
+        for i in range(count)
+    ]
+
+
+def _padding_article(number: int) -> _Section:
+    """Extra article to increase total pages without new issues."""
+    return _Section(
+        f"Článek {number} – Doplňující ujednání", 1, f"clanek_{number}", [
+            "Strany se dohodly, že toto ustanovení má pouze informativní "
+            "povahu a nezakládá žádná nová práva či povinnosti nad rámec "
+            "této smlouvy.",
+            "Ustanovení se vykládá v souladu s ostatními částmi smlouvy "
+            "a má zajistit dostatečnou srozumitelnost a přehlednost "
+            "dokumentu.",
+            *_padding(f"Článek {number}", count=4),
+        ],
+    )
+
+
+SECTIONS = [
     # ── TITLE ──────────────────────────────────────────────
-    doc.add_heading("Smlouva o dílo č. 2024/001", level=0)
+    _Section("Smlouva o dílo č. 2024/001", 0),
 
     # ── ČLÁNEK 1 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 1 – Smluvní strany", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_1", bm_id)
-
-    doc.add_paragraph(
+    _Section("Článek 1 – Smluvní strany", 1, "clanek_1", [
         "Objednatel: Město Příbram, IČO: 00243132, se sídlem Tyršova 108, "
         "261 01 Příbram I, zastoupené starostou Ing. Janem Konvalinkou "
-        '(dále jen „Objednatel").'
-    )
-    doc.add_paragraph(
+        '(dále jen „Objednatel").',
         "Zhotovitel: ABC Stavby s.r.o., IČO: 12345678, se sídlem Pražská 15, "
         "261 01 Příbram, zastoupená jednatelem Petrem Dvořákem "
-        '(dále jen „Zhotovitel").'
-    )
+        '(dále jen „Zhotovitel").',
+    ]),
 
     # ── ČLÁNEK 2 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 2 – Předmět smlouvy", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_2", bm_id)
-
-    doc.add_paragraph(
+    _Section("Článek 2 – Předmět smlouvy", 1, "clanek_2", [
         "Předmětem této smlouvy je provedení stavebních prací na objektu "
         "Základní školy Příbram, ul. Školní 5, a to v rozsahu dle projektové "
         "dokumentace, která tvoří přílohu č. 1 této smlouvy "
-        '(dále jen „Dílo").'
-    )
-
-    doc.add_heading("2.1 Rozsah díla", level=2)
-    doc.add_paragraph("Dílo zahrnuje zejména:")
-
-    # ✓ GOOD enumeration — consistent semicolons, period at end
-    doc.add_paragraph(
-        "a) demoliční práce dle bodu 3.1 projektové dokumentace;",
-        style="List Number",
-    )
-    doc.add_paragraph(
-        "b) stavební úpravy nosných konstrukcí;", style="List Number"
-    )
-    doc.add_paragraph(
-        "c) instalace nových rozvodů elektřiny a vody;", style="List Number"
-    )
-    doc.add_paragraph(
-        "d) dokončovací a úklidové práce.", style="List Number"
-    )
-
-    doc.add_heading("2.2 Místo plnění", level=2)
-    doc.add_paragraph(
+        '(dále jen „Dílo").',
+    ]),
+    _Section("2.1 Rozsah díla", 2, paragraphs=[
+        "Dílo zahrnuje zejména:",
+        # ✓ GOOD enumeration — consistent semicolons, period at end
+        ("a) demoliční práce dle bodu 3.1 projektové dokumentace;",
+         "ListNumber"),
+        ("b) stavební úpravy nosných konstrukcí;", "ListNumber"),
+        ("c) instalace nových rozvodů elektřiny a vody;", "ListNumber"),
+        ("d) dokončovací a úklidové práce.", "ListNumber"),
+    ]),
+    _Section("2.2 Místo plnění", 2, paragraphs=[
         "Místem plnění je objekt Základní školy Příbram na adrese "
-        "Školní 5, 261 01 Příbram."
-    )
+        "Školní 5, 261 01 Příbram.",
+    ]),
 
     # ── ČLÁNEK 3 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 3 – Cena díla", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_3", bm_id)
-
-    # ✗ WHITESPACE: double spaces
-    doc.add_paragraph(
+    _Section("Článek 3 – Cena díla", 1, "clanek_3", [
+        # ✗ WHITESPACE: double spaces
         "Celková cena díla  činí 4 500 000 Kč bez DPH  (slovy: čtyři miliony "
         "pět set tisíc korun českých). Cena je stanovena jako cena nejvýše "
-        "přípustná."
-    )
-
-    doc.add_heading("3.1 Platební podmínky", level=2)
-    doc.add_paragraph("Cena bude hrazena následovně:")
-
-    # ✗ BAD enumeration — mixed delimiters: comma, semicolon, comma, nothing
-    doc.add_paragraph(
-        "(i) záloha ve výši 30 % při podpisu smlouvy,"
-    )
-    doc.add_paragraph(
-        "(ii) průběžné měsíční fakturace dle skutečně provedených prací;"
-    )
-    doc.add_paragraph("(iii) závěrečná faktura po předání díla,")
-    doc.add_paragraph(
-        "(iv) pozastávka ve výši 10 % bude uvolněna po uplynutí záruční doby"
-    )
-
-    doc.add_heading("3.2 Fakturace", level=2)
-    doc.add_paragraph(
+        "přípustná.",
+    ]),
+    _Section("3.1 Platební podmínky", 2, paragraphs=[
+        "Cena bude hrazena následovně:",
+        # ✗ BAD enumeration — mixed delimiters: comma, semicolon, comma, nothing
+        "(i) záloha ve výši 30 % při podpisu smlouvy,",
+        "(ii) průběžné měsíční fakturace dle skutečně provedených prací;",
+        "(iii) závěrečná faktura po předání díla,",
+        "(iv) pozastávka ve výši 10 % bude uvolněna po uplynutí záruční doby",
+    ]),
+    _Section("3.2 Fakturace", 2, paragraphs=[
         "Zhotovitel je oprávněn fakturovat provedené práce měsíčně, vždy "
         "k poslednímu dni kalendářního měsíce. Splatnost faktur činí 30 dnů "
-        "ode dne doručení Objednateli."
-    )
+        "ode dne doručení Objednateli.",
+    ]),
 
     # ── ČLÁNEK 4 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 4 – Termín plnění", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_4", bm_id)
-
-    doc.add_paragraph(
-        "Zhotovitel se zavazuje provést dílo v následujících termínech:"
-    )
-    doc.add_paragraph(
-        "a) zahájení prací: do 14 dnů od nabytí účinnosti smlouvy;"
-    )
-    doc.add_paragraph("b) dokončení díla: nejpozději do 31. 12. 2025.")
-
-    # ✗ WHITESPACE: trailing spaces
-    doc.add_paragraph(
+    _Section("Článek 4 – Termín plnění", 1, "clanek_4", [
+        "Zhotovitel se zavazuje provést dílo v následujících termínech:",
+        "a) zahájení prací: do 14 dnů od nabytí účinnosti smlouvy;",
+        "b) dokončení díla: nejpozději do 31. 12. 2025.",
+        # ✗ WHITESPACE: trailing spaces
         "V případě prodlení Zhotovitele s dokončením díla dle článku 4 "
         "je Objednatel oprávněn požadovat smluvní pokutu dle čl. 7 "
-        "této smlouvy.   "
-    )
+        "této smlouvy.   ",
+    ]),
 
     # ── ČLÁNEK 5 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 5 – Práva a povinnosti smluvních stran", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_5", bm_id)
-
-    doc.add_heading("5.1 Povinnosti Zhotovitele", level=2)
-    doc.add_paragraph(
+    _Section("Článek 5 – Práva a povinnosti smluvních stran", 1, "clanek_5"),
+    _Section("5.1 Povinnosti Zhotovitele", 2, paragraphs=[
         "Zhotovitel je povinen provést dílo řádně, v souladu s touto smlouvou, "
         "projektovou dokumentací a platnými technickými normami. Zhotovitel je "
-        "dále povinen dodržovat bezpečnostní předpisy dle přílohy č. 2."
-    )
-    # plain-text references (should be field codes)
-    doc.add_paragraph(
+        "dále povinen dodržovat bezpečnostní předpisy dle přílohy č. 2.",
+        # plain-text references (should be field codes)
         "Zhotovitel je povinen postupovat v souladu s harmonogramem dle "
-        "článku 4 a dodržet cenový limit stanovený v článku 3."
-    )
-
-    doc.add_heading("5.2 Povinnosti Objednatele", level=2)
-    doc.add_paragraph(
+        "článku 4 a dodržet cenový limit stanovený v článku 3.",
+    ]),
+    _Section("5.2 Povinnosti Objednatele", 2, paragraphs=[
         "Objednatel je povinen předat Zhotoviteli staveniště do 7 dnů od "
         "nabytí účinnosti smlouvy. Objednatel je dále povinen poskytnout "
-        "součinnost potřebnou pro řádné provedení díla."
-    )
+        "součinnost potřebnou pro řádné provedení díla.",
+    ]),
 
     # ── ČLÁNEK 6 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 6 – Předání a převzetí díla", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_6", bm_id)
-
-    # ✗ REDUNDANCY #1: near-exact copy of Article 2 ¶1
-    doc.add_paragraph(
+    _Section("Článek 6 – Předání a převzetí díla", 1, "clanek_6", [
+        # ✗ REDUNDANCY #1: near-exact copy of Article 2 ¶1
         "Předmětem předání je provedení stavebních prací na objektu "
         "Základní školy Příbram, ul. Školní 5, a to v rozsahu dle "
-        "projektové dokumentace, která tvoří přílohu č. 1 této smlouvy."
-    )
-
-    doc.add_paragraph(
+        "projektové dokumentace, která tvoří přílohu č. 1 této smlouvy.",
         "O předání a převzetí díla bude sepsán předávací protokol podepsaný "
         "oběma smluvními stranami. Dílo se považuje za předané okamžikem "
-        "podpisu předávacího protokolu."
-    )
-
-    # ✗ WHITESPACE: consecutive blank paragraphs
-    doc.add_paragraph("")
-    doc.add_paragraph("")
-
-    doc.add_paragraph(
+        "podpisu předávacího protokolu.",
+        # ✗ WHITESPACE: consecutive blank paragraphs
+        "",
+        "",
         "Objednatel je oprávněn odmítnout převzetí díla, pokud dílo vykazuje "
-        "vady bránící jeho řádnému užívání."
-    )
+        "vady bránící jeho řádnému užívání.",
+    ]),
 
     # ── ČLÁNEK 7 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 7 – Smluvní pokuty", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_7", bm_id)
-
-    doc.add_paragraph(
+    _Section("Článek 7 – Smluvní pokuty", 1, "clanek_7", [
         "V případě prodlení Zhotovitele s termínem dokončení díla dle čl. 4 "
         "je Objednatel oprávněn požadovat smluvní pokutu ve výši 0,05 % "
-        "z celkové ceny díla za každý započatý den prodlení."
-    )
-
-    # ✗ INVALID REFERENCE: článek 12 doesn't exist
-    doc.add_paragraph(
+        "z celkové ceny díla za každý započatý den prodlení.",
+        # ✗ INVALID REFERENCE: článek 12 doesn't exist
         "V případě porušení povinností dle článku 12 je Zhotovitel povinen "
         "uhradit smluvní pokutu ve výši 50 000 Kč za každý jednotlivý "
-        "případ porušení."
-    )
-
-    # ✗ WHITESPACE: leading whitespace
-    doc.add_paragraph(
-        "  Uplatněním smluvní pokuty není dotčeno právo na náhradu škody."
-    )
+        "případ porušení.",
+        # ✗ WHITESPACE: leading whitespace
+        "  Uplatněním smluvní pokuty není dotčeno právo na náhradu škody.",
+    ]),
 
     # ── ČLÁNEK 8 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 8 – Záruční podmínky", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_8", bm_id)
-
-    doc.add_paragraph(
+    _Section("Článek 8 – Záruční podmínky", 1, "clanek_8", [
         "Zhotovitel poskytuje na dílo záruku v délce 60 měsíců ode dne "
-        "předání a převzetí díla dle článku 6 této smlouvy."
-    )
-
-    doc.add_paragraph("Záruční podmínky se nevztahují na:")
-
-    # ✗ BAD enumeration — last items: semicolon, semicolon, comma, nothing
-    doc.add_paragraph(
-        "(a) vady způsobené nesprávným užíváním díla Objednatelem;"
-    )
-    doc.add_paragraph(
-        "(b) vady vzniklé v důsledku zásahu vyšší moci;"
-    )
-    doc.add_paragraph("(c) běžné opotřebení díla,")
-    doc.add_paragraph(
-        "(d) vady způsobené zásahem třetích osob bez souhlasu Zhotovitele"
-    )
+        "předání a převzetí díla dle článku 6 této smlouvy.",
+        "Záruční podmínky se nevztahují na:",
+        # ✗ BAD enumeration — last items: semicolon, semicolon, comma, nothing
+        "(a) vady způsobené nesprávným užíváním díla Objednatelem;",
+        "(b) vady vzniklé v důsledku zásahu vyšší moci;",
+        "(c) běžné opotřebení díla,",
+        "(d) vady způsobené zásahem třetích osob bez souhlasu Zhotovitele",
+    ]),
 
     # ── ČLÁNEK 9 ───────────────────────────────────────────
-    h = doc.add_heading("Článek 9 – Odstoupení od smlouvy", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_9", bm_id)
-
-    doc.add_paragraph(
+    _Section("Článek 9 – Odstoupení od smlouvy", 1, "clanek_9", [
         "Objednatel je oprávněn odstoupit od smlouvy v případě, že Zhotovitel "
         "je v prodlení s dokončením díla o více než 30 dnů oproti termínu "
-        "dle čl. 4."
-    )
-    doc.add_paragraph(
+        "dle čl. 4.",
         "Zhotovitel je oprávněn odstoupit od smlouvy v případě, že Objednatel "
-        "je v prodlení s úhradou faktur o více než 60 dnů."
-    )
-
-    # ✗ REDUNDANCY #2: verbatim copy of Article 7 ¶1
-    doc.add_paragraph(
+        "je v prodlení s úhradou faktur o více než 60 dnů.",
+        # ✗ REDUNDANCY #2: verbatim copy of Article 7 ¶1
         "V případě prodlení Zhotovitele s termínem dokončení díla dle čl. 4 "
         "je Objednatel oprávněn požadovat smluvní pokutu ve výši 0,05 % "
-        "z celkové ceny díla za každý započatý den prodlení."
-    )
+        "z celkové ceny díla za každý započatý den prodlení.",
+    ]),
 
     # ── ČLÁNEK 10 ──────────────────────────────────────────
-    h = doc.add_heading("Článek 10 – Závěrečná ustanovení", level=1)
-    bm_id += 1
-    add_bookmark(h, "clanek_10", bm_id)
-
-    doc.add_paragraph(
+    _Section("Článek 10 – Závěrečná ustanovení", 1, "clanek_10", [
         "Tato smlouva se řídí zákonem č. 89/2012 Sb., občanský zákoník, "
         "v platném znění. Smlouva nabývá účinnosti dnem podpisu oběma "
-        "smluvními stranami."
-    )
-
-    # reference to §
-    doc.add_paragraph(
+        "smluvními stranami.",
+        # reference to §
         "Pro účely této smlouvy se použijí ustanovení § 2586 a násl. "
-        "občanského zákoníku o smlouvě o dílo."
-    )
-
-    # ✗ WHITESPACE: double spaces
-    doc.add_paragraph(
+        "občanského zákoníku o smlouvě o dílo.",
+        # ✗ WHITESPACE: double spaces
         "Smlouva je vyhotovena ve  dvou stejnopisech, z nichž  každá "
-        "smluvní strana obdrží po jednom výtisku."
-    )
-
-    doc.add_paragraph(
-        "Nedílnou součástí této smlouvy jsou následující přílohy:"
-    )
-    doc.add_paragraph("Příloha č. 1 – Projektová dokumentace")
-    doc.add_paragraph("Příloha č. 2 – Bezpečnostní předpisy")
-    doc.add_paragraph("Příloha č. 3 – Harmonogram prací")
-
-    # ✗ INVALID REFERENCE: příloha č. 5 doesn't exist
-    doc.add_paragraph(
-        "Podrobnosti o pojištění jsou uvedeny v příloze č. 5 této smlouvy."
-    )
+        "smluvní strana obdrží po jednom výtisku.",
+        "Nedílnou součástí této smlouvy jsou následující přílohy:",
+        "Příloha č. 1 – Projektová dokumentace",
+        "Příloha č. 2 – Bezpečnostní předpisy",
+        "Příloha č. 3 – Harmonogram prací",
+        # ✗ INVALID REFERENCE: příloha č. 5 doesn't exist
+        "Podrobnosti o pojištění jsou uvedeny v příloze č. 5 této smlouvy.",
+    ]),
 
     # ── PADDING ARTICLES (to reach ~30 pages) ─────────────
-    add_padding_articles(11, 18)
+    *(_padding_article(number) for number in range(11, 19)),
 
     # ── PŘÍLOHA 1 ──────────────────────────────────────────
-    doc.add_page_break()
-    h = doc.add_heading("Příloha č. 1 – Projektová dokumentace", level=1)
-    bm_id += 1
-    add_bookmark(h, "priloha_1", bm_id)
-
-    # Elaboration of Article 2 — NOT redundant
-    doc.add_paragraph(
-        "Projektová dokumentace pro provedení stavebních prací na objektu "
-        "Základní školy Příbram specifikuje následující rozsah prací:"
-    )
-    add_padding_paragraphs("Příloha č. 1", count=5)
-
-    doc.add_heading("1.1 Demoliční práce", level=2)
-    doc.add_paragraph(
+    _Section(
+        "Příloha č. 1 – Projektová dokumentace", 1, "priloha_1", [
+            # Elaboration of Article 2 — NOT redundant
+            "Projektová dokumentace pro provedení stavebních prací na objektu "
+            "Základní školy Příbram specifikuje následující rozsah prací:",
+            *_padding("Příloha č. 1", count=5),
+        ],
+        page_break=True,
+    ),
+    _Section("1.1 Demoliční práce", 2, paragraphs=[
         "Demolice stávajících příček v 1. NP a 2. NP budovy, odstranění "
         "podlahových krytin a demontáž stávajících rozvodů elektřiny. "
-        "Celkový rozsah demoličních prací: cca 450 m² podlahové plochy."
-    )
-
-    doc.add_heading("1.2 Stavební úpravy", level=2)
-    doc.add_paragraph(
+        "Celkový rozsah demoličních prací: cca 450 m² podlahové plochy.",
+    ]),
+    _Section("1.2 Stavební úpravy", 2, paragraphs=[
         "Vyzdění nových příček dle výkresové dokumentace, provedení nových "
-        "podlah, oprava fasády v rozsahu dle výkresu č. D.1.4."
-    )
-
-    doc.add_heading("1.3 Instalace rozvodů", level=2)
-    doc.add_paragraph(
+        "podlah, oprava fasády v rozsahu dle výkresu č. D.1.4.",
+    ]),
+    _Section("1.3 Instalace rozvodů", 2, paragraphs=[
         "Nové rozvody elektřiny (silnoproud i slaboproud), vody a kanalizace "
-        "dle jednotlivých profesních částí projektové dokumentace."
-    )
+        "dle jednotlivých profesních částí projektové dokumentace.",
+    ]),
 
     # ── PŘÍLOHA 2 ──────────────────────────────────────────
-    doc.add_page_break()
-    h = doc.add_heading("Příloha č. 2 – Bezpečnostní předpisy", level=1)
-    bm_id += 1
-    add_bookmark(h, "priloha_2", bm_id)
-
-    doc.add_paragraph(
-        "Zhotovitel je povinen dodržovat následující bezpečnostní předpisy "
-        "při provádění díla:"
-    )
-
-    # ✓ GOOD enumeration — consistent semicolons, period at end
-    doc.add_paragraph(
-        "(a) Zákon č. 309/2006 Sb., o zajištění dalších podmínek bezpečnosti "
-        "a ochrany zdraví při práci;"
-    )
-    doc.add_paragraph(
-        "(b) Nařízení vlády č. 591/2006 Sb., o bližších minimálních "
-        "požadavcích na bezpečnost a ochranu zdraví při práci na "
-        "staveništích;"
-    )
-    doc.add_paragraph(
-        "(c) Nařízení vlády č. 362/2005 Sb., o bližších požadavcích na "
-        "bezpečnost a ochranu zdraví při práci na pracovištích s nebezpečím "
-        "pádu z výšky."
-    )
-
-    # ✗ REDUNDANCY #3: near-duplicate of Article 5.1 ¶1 (slight wording change)
-    doc.add_paragraph(
-        "Zhotovitel je povinen provést dílo řádně, v souladu s touto smlouvou, "
-        "projektovou dokumentací a platnými technickými normami. Zhotovitel "
-        "je povinen dodržovat bezpečnostní předpisy dle této přílohy."
-    )
-    add_padding_paragraphs("Příloha č. 2", count=5)
+    _Section(
+        "Příloha č. 2 – Bezpečnostní předpisy", 1, "priloha_2", [
+            "Zhotovitel je povinen dodržovat následující bezpečnostní předpisy "
+            "při provádění díla:",
+            # ✓ GOOD enumeration — consistent semicolons, period at end
+            "(a) Zákon č. 309/2006 Sb., o zajištění dalších podmínek "
+            "bezpečnosti a ochrany zdraví při práci;",
+            "(b) Nařízení vlády č. 591/2006 Sb., o bližších minimálních "
+            "požadavcích na bezpečnost a ochranu zdraví při práci na "
+            "staveništích;",
+            "(c) Nařízení vlády č. 362/2005 Sb., o bližších požadavcích na "
+            "bezpečnost a ochranu zdraví při práci na pracovištích s "
+            "nebezpečím pádu z výšky.",
+            # ✗ REDUNDANCY #3: near-duplicate of Article 5.1 ¶1 (slight
+            # wording change)
+            "Zhotovitel je povinen provést dílo řádně, v souladu s touto "
+            "smlouvou, projektovou dokumentací a platnými technickými "
+            "normami. Zhotovitel je povinen dodržovat bezpečnostní předpisy "
+            "dle této přílohy.",
+            *_padding("Příloha č. 2", count=5),
+        ],
+        page_break=True,
+    ),
 
     # ── PŘÍLOHA 3 ──────────────────────────────────────────
-    doc.add_page_break()
-    h = doc.add_heading("Příloha č. 3 – Harmonogram prací", level=1)
-    bm_id += 1
-    add_bookmark(h, "priloha_3", bm_id)
+    _Section(
+        "Příloha č. 3 – Harmonogram prací", 1, "priloha_3", [
+            "Harmonogram prací je stanoven v souladu s článkem 4 této "
+            "smlouvy.",
+            "Etapa 1 (měsíc 1–2): Demoliční práce a příprava staveniště",
+            "Etapa 2 (měsíc 2–4): Stavební úpravy nosných konstrukcí",
+            "Etapa 3 (měsíc 4–6): Instalace rozvodů",
+            "Etapa 4 (měsíc 6–7): Dokončovací práce a úklid",
+            # ✗ WHITESPACE: double space
+            "Zhotovitel je povinen  informovat Objednatele o průběhu prací "
+            "minimálně jednou týdně.",
+            *_padding("Příloha č. 3", count=6),
+        ],
+        page_break=True,
+    ),
+]
+
+
+def _emit_section(body, section: _Section, bm_id: int) -> None:
+    """Append *section*'s heading and paragraphs to *body*.
+
+    bm_id is the id for the heading's bookmark, if the section has one.
+    """
+    if section.page_break:
+        _append_page_break(body)
+    style_id = "Title" if section.level == 0 else f"Heading{section.level}"
+    heading = _append_paragraph(body, section.title, style_id)
+    if section.bookmark is not None:
+        add_bookmark(heading, section.bookmark, bm_id)
+    for paragraph in section.paragraphs:
+        if isinstance(paragraph, str):
+            _append_paragraph(body, paragraph)
+        else:
+            _append_paragraph(body, *paragraph)
+
+
+@functools.lru_cache(maxsize=1)
+def _template():
+    """python-docx's default template, loaded once per process."""
+    return Document()
 
-    doc.add_paragraph(
-        "Harmonogram prací je stanoven v souladu s článkem 4 této smlouvy."
-    )
 
-    doc.add_paragraph(
-        "Etapa 1 (měsíc 1–2): Demoliční práce a příprava staveniště"
-    )
-    doc.add_paragraph(
-        "Etapa 2 (měsíc 2–4): Stavební úpravy nosných konstrukcí"
-    )
-    doc.add_paragraph("Etapa 3 (měsíc 4–6): Instalace rozvodů")
-    doc.add_paragraph("Etapa 4 (měsíc 6–7): Dokončovací práce a úklid")
+def create_test_document(output_path: str):
+    # A deep copy of the loaded template skips re-reading and re-parsing
+    # the template package on every build in the same process
+    doc = copy.deepcopy(_template())
 
-    # ✗ WHITESPACE: double space
-    doc.add_paragraph(
-        "Zhotovitel je povinen  informovat Objednatele o průběhu prací "
-        "minimálně jednou týdně."
-    )
-    add_padding_paragraphs("Příloha č. 3", count=6)
+    # Default font
+    style = doc.styles["Normal"]
+    style.font.name = "Times New Roman"
+    style.font.size = Pt(12)
+
+    body = doc.element.body
+    bm_id = 0  # bookmark counter
+    for section in SECTIONS:
+        if section.bookmark is not None:
+            bm_id += 1
+        _emit_section(body, section, bm_id)
 
     # ── save ───────────────────────────────────────────────
+    # Written to a temp file and moved into place, so a concurrent or
+    # interrupted build never leaves a truncated .docx at output_path
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    doc.save(output_path)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    doc.save(tmp_path)
+    os.replace(tmp_path, output_path)
     print(f"Created: {output_path}")
 
 
 if __name__ == "__main__":
-    path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-        "documents",
-        "test_smlouva.docx",
-    )
-    create_test_document(path)
+    try:  # python -m tests.generate_test_doc
+        from tests._paths import TEST_DOC_PATH
+    except ImportError:  # python tests/generate_test_doc.py
+        from _paths import TEST_DOC_PATH
+
+    create_test_document(str(TEST_DOC_PATH))
@@ -98,4 +98,11 @@ GROUND_TRUTH = {
             },
         ],
     },
-}
\ No newline at end of file
+}
+# Expected minimum issue counts, precomputed for the test assertions
+EXPECTED_DOUBLE_SPACE = len(GROUND_TRUTH["whitespace"]["double_space"])
+EXPECTED_TRAILING_WHITESPACE = len(GROUND_TRUTH["whitespace"]["trailing_whitespace"])
+EXPECTED_LEADING_WHITESPACE = len(GROUND_TRUTH["whitespace"]["leading_whitespace"])
+EXPECTED_CONSECUTIVE_BLANKS = len(
+    GROUND_TRUTH["whitespace"]["consecutive_blank_paragraphs"]
+)
@@ -1,28 +1,36 @@
 import json
 import os
+import shutil
 import zipfile
 
 import pytest
-
-from mcp_server.checks import check_whitespace
+from docx import Document
+from docx.oxml.ns import qn
+from lxml import etree
+
+from mcp_server.checks import (
+    check_enumerations,
+    check_enumerations_many,
+    check_whitespace,
+    check_whitespace_many,
+    extract_and_validate_references,
+    extract_and_validate_references_many,
+    run_all_checks,
+)
 from mcp_server.docx_parser import (
+    _cached_document,
     get_all_sections_summary,
     get_section_content,
     load_document_structure,
 )
-from tests.ground_truth import GROUND_TRUTH
-
-
-TEST_DOC_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "documents",
-    "test_smlouva.docx",
-)
-OUTPUT_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "output",
+from tests.ground_truth import (
+    EXPECTED_CONSECUTIVE_BLANKS,
+    EXPECTED_DOUBLE_SPACE,
+    EXPECTED_LEADING_WHITESPACE,
+    EXPECTED_TRAILING_WHITESPACE,
 )
 
+
 # Minimal findings fixture used by report tests
 _FINDINGS = {
     "whitespace": {
@@ -65,60 +73,80 @@ _FINDINGS = {
 }
 
 
-def _load_whitespace_issues():
-    result = check_whitespace(TEST_DOC_PATH)
+@pytest.fixture(scope="session")
+def whitespace_issues(test_doc_path):
+    result = check_whitespace(test_doc_path)
     assert "issues" in result, result
     return result["issues"]
 
 
+@pytest.fixture(scope="session")
+def enumeration_result(test_doc_path):
+    return check_enumerations(test_doc_path)
+
+
+@pytest.fixture(scope="session")
+def reference_result(test_doc_path):
+    return extract_and_validate_references(test_doc_path)
+
+
+@pytest.fixture(scope="session")
+def invalid_ref_texts(reference_result):
+    return {ref["text"] for ref in reference_result.get("invalid", [])}
+
+
+@pytest.fixture(scope="session")
+def structure(test_doc_path):
+    return load_document_structure(test_doc_path)
+
+
 def _filter_issue_types(issues, issue_type: str):
     return [issue for issue in issues if issue["type"] == issue_type]
 
 
-def test_whitespace_double_spaces():
-    issues = _load_whitespace_issues()
-    matches = _filter_issue_types(issues, "double_space")
-    assert len(matches) >= len(GROUND_TRUTH["whitespace"]["double_space"])
+def test_whitespace_double_spaces(whitespace_issues):
+    matches = _filter_issue_types(whitespace_issues, "double_space")
+    assert len(matches) >= EXPECTED_DOUBLE_SPACE
 
 
-def test_whitespace_trailing_spaces():
-    issues = _load_whitespace_issues()
-    matches = _filter_issue_types(issues, "trailing_whitespace")
-    assert len(matches) >= len(GROUND_TRUTH["whitespace"]["trailing_whitespace"])
+def test_whitespace_trailing_spaces(whitespace_issues):
+    matches = _filter_issue_types(whitespace_issues, "trailing_whitespace")
+    assert len(matches) >= EXPECTED_TRAILING_WHITESPACE
 
 
-def test_whitespace_leading_spaces():
-    issues = _load_whitespace_issues()
-    matches = _filter_issue_types(issues, "leading_whitespace")
-    assert len(matches) >= len(GROUND_TRUTH["whitespace"]["leading_whitespace"])
+def test_whitespace_leading_spaces(whitespace_issues):
+    matches = _filter_issue_types(whitespace_issues, "leading_whitespace")
+    assert len(matches) >= EXPECTED_LEADING_WHITESPACE
 
 
-def test_whitespace_consecutive_blanks():
-    issues = _load_whitespace_issues()
-    matches = _filter_issue_types(issues, "consecutive_blank_paragraphs")
-    assert len(matches) >= len(
-        GROUND_TRUTH["whitespace"]["consecutive_blank_paragraphs"]
-    )
+def test_whitespace_consecutive_blanks(whitespace_issues):
+    matches = _filter_issue_types(whitespace_issues, "consecutive_blank_paragraphs")
+    assert len(matches) >= EXPECTED_CONSECUTIVE_BLANKS
+
 
+def test_whitespace_count_only(test_doc_path):
+    full = check_whitespace(test_doc_path)
+    counted = check_whitespace(test_doc_path, count_only=True)
+    assert counted == {"filepath": test_doc_path, "issue_count": full["issue_count"]}
 
-def test_load_structure_headings():
-    structure = load_document_structure(TEST_DOC_PATH)
+
+def test_load_structure_headings(structure):
     assert structure["heading_count"] >= 20
     assert structure["heading_tree"], "Heading tree should not be empty"
 
 
-def test_section_content_article_2():
-    section = get_section_content(TEST_DOC_PATH, "Článek 2 – Předmět smlouvy")
+def test_section_content_article_2(test_doc_path):
+    section = get_section_content(test_doc_path, "Článek 2 – Předmět smlouvy")
     assert "Předmětem této smlouvy" in section["content"]
 
 
-def test_sections_summary_verbatim_paragraph_overlap():
+def test_sections_summary_verbatim_paragraph_overlap(test_doc_path):
     """The verbatim duplicate is a single paragraph inside two different
     sections (Article 7 and Article 9).  Whole-section hashes differ,
     so we verify via the preview text that the shared paragraph appears
     in both sections' previews."""
-    art7 = get_section_content(TEST_DOC_PATH, "Článek 7 – Smluvní pokuty")
-    art9 = get_section_content(TEST_DOC_PATH, "Článek 9 – Odstoupení od smlouvy")
+    art7 = get_section_content(test_doc_path, "Článek 7 – Smluvní pokuty")
+    art9 = get_section_content(test_doc_path, "Článek 9 – Odstoupení od smlouvy")
     shared = (
         "V případě prodlení Zhotovitele s termínem dokončení díla dle čl. 4 "
         "je Objednatel oprávněn požadovat smluvní pokutu ve výši 0,05 %"
@@ -127,72 +155,124 @@ def test_sections_summary_verbatim_paragraph_overlap():
     assert shared in art9["content"], "Shared paragraph missing from Article 9"
 
 
-def test_enumeration_bad_article_3():
-    from mcp_server.checks import check_enumerations  # noqa: WPS433
+def test_document_cache_invalidated_on_change(test_doc_path, tmp_path):
+    path = tmp_path / "copy.docx"
+    shutil.copyfile(test_doc_path, path)
+    before = load_document_structure(str(path))["paragraph_count"]
+
+    doc = Document(str(path))
+    doc.add_paragraph("Nový odstavec.")
+    doc.save(str(path))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert load_document_structure(str(path))["paragraph_count"] == before + 1
+
 
-    result = check_enumerations(TEST_DOC_PATH)
+def test_enumeration_bad_article_3(enumeration_result):
     assert any(
         issue.get("section") == "3.1 Platební podmínky"
-        for issue in result.get("issues", [])
+        for issue in enumeration_result.get("issues", [])
     )
 
 
-def test_enumeration_bad_article_8():
-    from mcp_server.checks import check_enumerations  # noqa: WPS433
-
-    result = check_enumerations(TEST_DOC_PATH)
+def test_enumeration_bad_article_8(enumeration_result):
     assert any(
         issue.get("section") == "Článek 8 – Záruční podmínky"
-        for issue in result.get("issues", [])
+        for issue in enumeration_result.get("issues", [])
     )
 
 
-def test_enumeration_good_article_2():
-    from mcp_server.checks import check_enumerations  # noqa: WPS433
-
-    result = check_enumerations(TEST_DOC_PATH)
+def test_enumeration_good_article_2(enumeration_result):
     assert not any(
         issue.get("section") == "2.1 Rozsah díla"
-        for issue in result.get("issues", [])
+        for issue in enumeration_result.get("issues", [])
     )
 
 
-def test_reference_invalid_priloha_5():
-    from mcp_server.checks import extract_and_validate_references  # noqa: WPS433
-
-    result = extract_and_validate_references(TEST_DOC_PATH)
-    assert any(
-        ref.get("text") == "příloha č. 5" for ref in result.get("invalid", [])
-    )
+def test_reference_invalid_priloha_5(invalid_ref_texts):
+    assert "příloha č. 5" in invalid_ref_texts
 
 
-def test_reference_valid_article_12():
+def test_reference_valid_article_12(invalid_ref_texts):
     # Article 12 exists as a heading ("Článek 12 – Doplňující ujednání"),
     # so the reference in Article 7 is structurally valid even though the
     # section contains only boilerplate — semantic validation is out of scope.
-    from mcp_server.checks import extract_and_validate_references  # noqa: WPS433
+    assert "článek 12" not in invalid_ref_texts
 
-    result = extract_and_validate_references(TEST_DOC_PATH)
-    assert not any(
-        ref.get("text") == "článek 12" for ref in result.get("invalid", [])
+
+def test_reference_field_code_violations(reference_result):
+    assert reference_result.get("field_code_violations")
+
+
+def test_run_all_checks_matches_single_checks(test_doc_path):
+    whitespace = check_whitespace(test_doc_path)
+    enumerations = check_enumerations(test_doc_path)
+
+    assert run_all_checks(test_doc_path) == {
+        "filepath": test_doc_path,
+        "whitespace": {
+            "issue_count": whitespace["issue_count"],
+            "issues": whitespace["issues"],
+        },
+        "enumerations": {
+            "issue_count": enumerations["issue_count"],
+            "issues": enumerations["issues"],
+        },
+    }
+
+
+def test_reference_bookmark_inside_run(tmp_path):
+    doc = Document()
+    run = doc.add_paragraph().add_run("Cíl odkazu")
+    bm = run._r.makeelement(qn("w:bookmarkStart"), {
+        qn("w:id"): "1", qn("w:name"): "cil",
+    })
+    run._r.append(bm)
+    path = tmp_path / "bookmark_in_run.docx"
+    doc.save(str(path))
+
+    result = extract_and_validate_references(str(path))
+    assert result["bookmarks"] == ["cil"]
+
+
+def test_check_whitespace_many_matches_single(test_doc_path):
+    results = check_whitespace_many([test_doc_path, test_doc_path], workers=2)
+    assert results == [check_whitespace(test_doc_path)] * 2
+
+
+def test_check_enumerations_many_matches_single(test_doc_path):
+    results = check_enumerations_many([test_doc_path, test_doc_path], workers=2)
+    assert results == [check_enumerations(test_doc_path)] * 2
+
+
+def test_extract_and_validate_references_many_matches_single(test_doc_path):
+    results = extract_and_validate_references_many(
+        [test_doc_path, test_doc_path], workers=2
     )
+    assert results == [extract_and_validate_references(test_doc_path)] * 2
+
 
+def test_map_files_worker_count_validation(test_doc_path, monkeypatch):
+    expected = [check_whitespace(test_doc_path)]
+    assert check_whitespace_many([test_doc_path], workers=0) == expected
 
-def test_reference_field_code_violations():
-    from mcp_server.checks import extract_and_validate_references  # noqa: WPS433
+    monkeypatch.setenv("LEGAL_ANALYZER_WORKERS", "0")
+    assert check_whitespace_many([test_doc_path]) == expected
 
-    result = extract_and_validate_references(TEST_DOC_PATH)
-    assert result.get("field_code_violations")
+    monkeypatch.setenv("LEGAL_ANALYZER_WORKERS", "two")
+    with pytest.raises(ValueError, match="LEGAL_ANALYZER_WORKERS"):
+        check_whitespace_many([test_doc_path])
 
 
 # ── Phase 7: report generation ──────────────────────────────────────
 
 
-def test_save_results_markdown(tmp_path):
+def test_save_results_markdown(test_doc_path, tmp_path):
     from mcp_server.report import save_results
 
     out = tmp_path / "report.md"
-    result = save_results(TEST_DOC_PATH, json.dumps(_FINDINGS), str(out), "markdown")
+    result = save_results(test_doc_path, json.dumps(_FINDINGS), str(out), "markdown")
 
     assert result.get("format") == "markdown"
     assert result.get("written_bytes", 0) > 0
@@ -207,11 +287,11 @@ def test_save_results_markdown(tmp_path):
     assert "field codes" in content
 
 
-def test_save_results_docx(tmp_path):
+def test_save_results_docx(test_doc_path, tmp_path):
     from mcp_server.report import save_results
 
     out = tmp_path / "annotated.docx"
-    result = save_results(TEST_DOC_PATH, json.dumps(_FINDINGS), str(out), "docx")
+    result = save_results(test_doc_path, json.dumps(_FINDINGS), str(out), "docx")
 
     assert result.get("format") == "docx"
     assert result.get("written_bytes", 0) > 0
@@ -223,4 +303,86 @@ def test_save_results_docx(tmp_path):
         assert "word/comments.xml" in zf.namelist()
         comments_xml = zf.read("word/comments.xml").decode("utf-8")
     assert "Legal Analyzer" in comments_xml
-    assert "WHITESPACE" in comments_xml
\ No newline at end of file
+    assert "WHITESPACE" in comments_xml
+
+
+def test_save_results_docx_reannotate(test_doc_path, tmp_path):
+    from mcp_server.report import save_results
+
+    first = tmp_path / "first.docx"
+    second = tmp_path / "second.docx"
+    save_results(test_doc_path, json.dumps(_FINDINGS), str(first), "docx")
+    save_results(str(first), json.dumps(_FINDINGS), str(second), "docx")
+
+    with zipfile.ZipFile(str(second)) as zf:
+        names = zf.namelist()
+        comments_xml = zf.read("word/comments.xml").decode("utf-8")
+    assert names.count("word/comments.xml") == 1
+    assert comments_xml.count("Legal Analyzer") == 2 * (
+        _FINDINGS["whitespace"]["issue_count"]
+        + _FINDINGS["enumerations"]["issue_count"]
+        + len(_FINDINGS["references"]["invalid"])
+    )
+
+
+def test_save_results_docx_failure_leaves_no_temp_file(tmp_path):
+    from mcp_server.report import save_results
+
+    broken = tmp_path / "broken.docx"
+    with zipfile.ZipFile(str(broken), "w") as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")  # no word/document.xml
+    out = tmp_path / "out" / "annotated.docx"
+
+    with pytest.raises(KeyError):
+        save_results(str(broken), json.dumps(_FINDINGS), str(out), "docx")
+    assert not out.exists()
+    assert list(out.parent.iterdir()) == []
+
+
+def test_save_results_docx_reuses_only_cached_document(test_doc_path, tmp_path):
+    from mcp_server.report import save_results
+
+    src = tmp_path / "src.docx"
+    shutil.copyfile(test_doc_path, src)
+    cold = tmp_path / "cold.docx"
+    warm = tmp_path / "warm.docx"
+
+    save_results(str(src), json.dumps(_FINDINGS), str(cold), "docx")
+    assert _cached_document(str(src)) is None  # not loaded just to annotate
+
+    load_document_structure(str(src))
+    assert _cached_document(str(src)) is not None
+    save_results(str(src), json.dumps(_FINDINGS), str(warm), "docx")
+
+    with zipfile.ZipFile(str(cold)) as zc, zipfile.ZipFile(str(warm)) as zw:
+        assert zc.read("word/document.xml") == zw.read("word/document.xml")
+
+
+def test_save_results_docx_warm_path_drops_only_blank_text(test_doc_path, tmp_path):
+    from mcp_server.report import save_results
+
+    # Pretty-printed document.xml, as some Word-authored files have
+    src = tmp_path / "pretty.docx"
+    with zipfile.ZipFile(test_doc_path) as zin, zipfile.ZipFile(str(src), "w") as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "word/document.xml":
+                data = etree.tostring(
+                    etree.fromstring(data), xml_declaration=True,
+                    encoding="UTF-8", standalone=True, pretty_print=True,
+                )
+            zout.writestr(item, data)
+    cold = tmp_path / "cold.docx"
+    warm = tmp_path / "warm.docx"
+
+    save_results(str(src), json.dumps(_FINDINGS), str(cold), "docx")
+    load_document_structure(str(src))
+    save_results(str(src), json.dumps(_FINDINGS), str(warm), "docx")
+
+    blankless = etree.XMLParser(remove_blank_text=True)
+    with zipfile.ZipFile(str(cold)) as zc, zipfile.ZipFile(str(warm)) as zw:
+        cold_xml = zc.read("word/document.xml")
+        warm_xml = zw.read("word/document.xml")
+    assert etree.tostring(etree.fromstring(cold_xml, blankless)) == etree.tostring(
+        etree.fromstring(warm_xml, blankless)
+    )